@@ -0,0 +1,64 @@
+"""access path indexes
+
+Revision ID: 7c3e1a9d4b20
+Revises: 2b7e4c9f1a06
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e1a9d4b20'
+down_revision: Union[str, None] = '2b7e4c9f1a06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('accounts', 'ix_accounts_deleted_id', ['deleted', 'id']),
+    ('accounts', 'ix_accounts_deleted_updated_at', ['deleted', 'updated_at']),
+    ('accounts', 'ix_accounts_username_deleted', ['username', 'deleted']),
+    ('accounts', 'ix_accounts_surname', ['surname']),
+    ('accounts', 'ix_accounts_department', ['department']),
+    ('accounts', 'ix_accounts_post', ['post']),
+    ('groups', 'ix_groups_deleted_id', ['deleted', 'id']),
+    ('groups', 'ix_groups_deleted_updated_at', ['deleted', 'updated_at']),
+    ('groups', 'ix_groups_name', ['name']),
+    ('servers', 'ix_servers_deleted_id', ['deleted', 'id']),
+    ('servers', 'ix_servers_deleted_updated_at', ['deleted', 'updated_at']),
+    ('servers', 'ix_servers_ip_address', ['ip_address']),
+    ('servers', 'ix_servers_name', ['name']),
+    ('vms', 'ix_vms_deleted_id', ['deleted', 'id']),
+    ('vms', 'ix_vms_deleted_updated_at', ['deleted', 'updated_at']),
+    ('vms', 'ix_vms_name', ['name']),
+    ('vms', 'ix_vms_server_id_state', ['server_id', 'state']),
+    ('m2m_group_account', 'ix_m2m_group_account_account_id_group_id', ['account_id', 'group_id']),
+    ('m2m_group_vm', 'ix_m2m_group_vm_vm_id_group_id', ['vm_id', 'group_id']),
+]
+
+
+def _existing_indexes() -> dict[str, set[str]]:
+    inspector = sa.inspect(op.get_bind())
+    return {
+        table: {index['name'] for index in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+    }
+
+
+def upgrade() -> None:
+    # tables created by create_all or a later autogenerated revision already carry these indexes
+    existing = _existing_indexes()
+    for table, name, columns in INDEXES:
+        if table in existing and name not in existing[table]:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    existing = _existing_indexes()
+    for table, name, columns in reversed(INDEXES):
+        if name in existing.get(table, set()):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,106 @@
+"""archive tables
+
+Revision ID: 4f8b2d6e1c57
+Revises: 7c3e1a9d4b20
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8b2d6e1c57'
+down_revision: Union[str, None] = '7c3e1a9d4b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted', sa.Boolean(), nullable=True),
+    ]
+
+
+# archive copies of the hot tables as they were at this revision: same columns, no defaults,
+# constraints or indexes besides archived_at
+TABLES = [
+    ('archive_vms', lambda: _base_columns() + [
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('cpu', sa.Integer(), nullable=False),
+        sa.Column('ram', sa.Integer(), nullable=False),
+        sa.Column('ssd', sa.Integer(), nullable=False),
+        sa.Column('hdd', sa.Integer(), nullable=False),
+        sa.Column('state', sa.Boolean(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('ip_address', sa.String(length=15), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('password', sa.String(length=50), nullable=False),
+        sa.Column('server_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]),
+    ('archive_accounts', lambda: _base_columns() + [
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('hashed_password', sa.String(length=60), nullable=False),
+        sa.Column('surname', sa.String(length=100), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('middlename', sa.String(length=100), nullable=False),
+        sa.Column('department', sa.String(length=100), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=False),
+        sa.Column('cellular', sa.String(length=20), nullable=False),
+        sa.Column('post', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]),
+    ('archive_groups', lambda: _base_columns() + [
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]),
+    ('archive_servers', lambda: _base_columns() + [
+        sa.Column('ip_address', sa.String(length=15), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('specs', sa.Text(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('password', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]),
+    ('archive_versions', lambda: _base_columns() + [
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]),
+    ('archive_m2m_group_account', lambda: [
+        sa.Column('group_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('account_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.PrimaryKeyConstraint('group_id', 'account_id'),
+    ]),
+    ('archive_m2m_group_vm', lambda: [
+        sa.Column('group_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('vm_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.PrimaryKeyConstraint('group_id', 'vm_id'),
+    ]),
+]
+
+
+def upgrade() -> None:
+    # databases bootstrapped with DB_CREATE_TABLES=True already have these tables
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table, columns in TABLES:
+        if table in existing:
+            continue
+        op.create_table(table, *columns(), sa.Column('archived_at', sa.DateTime(), nullable=False))
+        op.create_index(f'ix_{table}_archived_at', table, ['archived_at'])
+
+
+def downgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table, _ in reversed(TABLES):
+        if table in existing:
+            op.drop_table(table)
@@ -0,0 +1,123 @@
+"""initial schema
+
+Revision ID: 2b7e4c9f1a06
+Revises:
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7e4c9f1a06'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted', sa.Boolean(), nullable=True),
+    ]
+
+
+TABLES = [
+    ('config', lambda: [
+        sa.Column('key', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    ]),
+    ('logs', lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('before', sa.JSON(), nullable=False),
+        sa.Column('after', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    ]),
+    ('versions', lambda: _base_columns() + [
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]),
+    ('accounts', lambda: _base_columns() + [
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('hashed_password', sa.String(length=60), nullable=False),
+        sa.Column('surname', sa.String(length=100), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('middlename', sa.String(length=100), nullable=False),
+        sa.Column('department', sa.String(length=100), nullable=False),
+        sa.Column('post', sa.String(length=100), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=False),
+        sa.Column('cellular', sa.String(length=20), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('username'),
+    ]),
+    ('groups', lambda: _base_columns() + [
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]),
+    ('servers', lambda: _base_columns() + [
+        sa.Column('ip_address', sa.String(length=15), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('specs', sa.Text(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('password', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]),
+    ('vms', lambda: _base_columns() + [
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('cpu', sa.Integer(), nullable=False),
+        sa.Column('ram', sa.Integer(), nullable=False),
+        sa.Column('ssd', sa.Integer(), nullable=False),
+        sa.Column('hdd', sa.Integer(), nullable=False),
+        sa.Column('state', sa.Boolean(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('ip_address', sa.String(length=15), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('password', sa.String(length=50), nullable=False),
+        sa.Column('server_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['server_id'], ['servers.id']),
+        sa.PrimaryKeyConstraint('id'),
+    ]),
+    ('m2m_group_account', lambda: [
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id']),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id']),
+        sa.PrimaryKeyConstraint('group_id', 'account_id'),
+    ]),
+    ('m2m_group_vm', lambda: [
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('vm_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id']),
+        sa.ForeignKeyConstraint(['vm_id'], ['vms.id']),
+        sa.PrimaryKeyConstraint('group_id', 'vm_id'),
+    ]),
+]
+
+
+def upgrade() -> None:
+    # databases bootstrapped with DB_CREATE_TABLES=True already have these tables
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table, columns in TABLES:
+        if table in existing:
+            continue
+        op.create_table(table, *columns())
+        if table not in ('config', 'm2m_group_account', 'm2m_group_vm'):
+            op.create_index(f'ix_{table}_id', table, ['id'])
+
+
+def downgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table, _ in reversed(TABLES):
+        if table in existing:
+            op.drop_table(table)
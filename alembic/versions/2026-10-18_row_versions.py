@@ -0,0 +1,51 @@
+"""row versions
+
+Revision ID: 9d2f6b3a8e41
+Revises: 4f8b2d6e1c57
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2f6b3a8e41'
+down_revision: Union[str, None] = '4f8b2d6e1c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('accounts', 'groups', 'servers', 'vms', 'versions')
+
+
+def _columns(inspector, table: str) -> set[str]:
+    return {column['name'] for column in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # tables created by create_all from the current models already carry the column and index
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+    for table in TABLES:
+        for target in (table, f'archive_{table}'):
+            if target in existing and 'version' not in _columns(inspector, target):
+                op.add_column(target, sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+        name = f'ix_{table}_deleted_version'
+        if table in existing and name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, ['deleted', 'version'])
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+    for table in TABLES:
+        name = f'ix_{table}_deleted_version'
+        if table in existing and name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
+        for target in (table, f'archive_{table}'):
+            if target in existing and 'version' in _columns(inspector, target):
+                with op.batch_alter_table(target) as batch_op:
+                    batch_op.drop_column('version')
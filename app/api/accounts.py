@@ -0,0 +1,121 @@
+from typing import Optional
+
+from fastapi import APIRouter, Body, HTTPException, Request, Response, status, Depends
+
+from app.dependencies.auth import Principal, get_current_principal
+from app.dependencies.pagination import get_fields, get_page_params
+from app.dependencies.services import get_account_service
+from app.schemas.account import AccountCreate, AccountOut, AccountUpsert
+from app.schemas.bulk import BulkIds, BulkPatch, BulkResult
+from app.schemas.page import Page
+from app.services.account_service import AccountService
+from app.utils.etag import etag_matches, make_etag, not_modified, projected
+from app.utils.pagination import PageParams
+
+router = APIRouter(prefix="/accounts", tags=["accounts"])
+
+
+@router.get("/", response_model=Page[AccountOut])
+async def get_all_accounts(
+        request: Request,
+        response: Response,
+        page: PageParams = Depends(get_page_params),
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    if principal.role == "owner":
+        version = await account_service.get_version(page=page)
+    else:
+        version = await account_service.get_version_by_account(principal.account, page=page)
+    etag = make_etag(principal, request.url.query, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    if principal.role == "owner":
+        result = await account_service.get_page(page)
+    else:
+        result = await account_service.get_page_by_account(page, principal.account)
+    return projected(result, etag) if page.fields else result
+
+
+@router.get("/{account_id}", response_model=AccountOut)
+async def get_account_by_id(
+        account_id: int,
+        request: Request,
+        response: Response,
+        fields: tuple[str, ...] = Depends(get_fields),
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    if principal.role == "owner":
+        version = await account_service.get_version(item_id=account_id)
+    else:
+        version = await account_service.get_version_by_account(principal.account, item_id=account_id)
+    etag = make_etag(principal, request.url.query, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    if principal.role == "owner":
+        account = await account_service.get_by_id(account_id, fields=fields)
+    else:
+        account = await account_service.get_account_by_id_by_account(account_id, principal.account, fields=fields)
+
+    if not account:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+    return projected(account, etag) if fields else account
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_accounts(
+        items: list[AccountCreate] = Body(..., min_length=1, max_length=1000),
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await account_service.bulk_create(items)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.put("/bulk", response_model=BulkResult)
+async def bulk_upsert_accounts(
+        items: list[AccountUpsert] = Body(..., min_length=1, max_length=1000),
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await account_service.bulk_upsert(items)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_accounts(
+        patch: BulkPatch,
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await account_service.bulk_update(patch.ids, patch.data)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.delete("/bulk", response_model=BulkResult)
+async def bulk_delete_accounts(
+        bulk: BulkIds,
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await account_service.bulk_delete(bulk.ids)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
@@ -3,156 +3,178 @@ from typing import List, Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.dependencies.auth import get_current_admin, get_current_owner, get_current_user
-from app.schemas.admin import AdminCreate, AdminOut, AdminUpdate
-from app.schemas.owner import OwnerOut
+from app.dependencies.auth import Principal, get_current_principal, get_current_admin, get_current_owner
+from app.dependencies.services import get_account_service
+from app.schemas.account import AccountCreate, AccountOut, AccountUpdate
 from app.schemas.token import Token
-from app.schemas.user import UserOut
-from app.services.admin_service import AdminService
-from app.dependencies.services import get_admin_service
+from app.services.account_service import AccountService
+from app.utils.account_cache import AccountSnapshot
 
 router = APIRouter(prefix="/admins", tags=["Admins"])
 
 
-@router.get("/profile", response_model=AdminOut)
+@router.get("/profile", response_model=AccountOut)
 async def get_admin_profile(
-        current_admin: Annotated[AdminOut, Depends(get_current_admin)],
+        current_admin: Annotated[Optional[AccountSnapshot], Depends(get_current_admin)],
+        account_service: AccountService = Depends(get_account_service),
 ):
     if current_admin is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    return current_admin
+    return await account_service.get_by_id(current_admin.id)
 
 
-@router.get("/", response_model=List[AdminOut])
+@router.get("/", response_model=List[AccountOut])
 async def get_all_admins(
-        admin_service: Annotated[AdminService, Depends(get_admin_service)],
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
-        current_admin: Optional[AdminOut] = Depends(get_current_admin),
-        current_user: Optional[UserOut] = Depends(get_current_user),
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
 ):
-    if current_owner:
-        return await admin_service.get_all()
-    if current_admin:
-        return await admin_service.get_all_admins_for_admin(current_admin)
-    if current_user:
-        return await admin_service.get_all_admins_for_user(current_user)
+    if principal and principal.role == "owner":
+        return await account_service.get_all_by_role("admin")
+    if principal:
+        return await account_service.get_all_by_role("admin", principal.account)
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid token",
     )
 
 
-@router.get("/{admin_id}", response_model=AdminOut)
+@router.get("/{admin_id}", response_model=AccountOut)
 async def get_admin_by_id(
         admin_id: int,
-        admin_service: Annotated[AdminService, Depends(get_admin_service)],
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
-        current_admin: Optional[AdminOut] = Depends(get_current_admin),
-        current_user: Optional[UserOut] = Depends(get_current_user),
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
 ):
-    if current_owner:
-        return await admin_service.get_by_id(admin_id)
-    if current_admin:
-        return await admin_service.get_admin_by_id_for_admin(admin_id, current_admin)
-    if current_user:
-        return await admin_service.get_admin_by_id_for_user(admin_id, current_user)
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
 
+    if principal.role == "owner":
+        admin = await account_service.get_by_id_by_role(admin_id, "admin")
+    else:
+        admin = await account_service.get_by_id_by_role(admin_id, "admin", principal.account)
 
-@router.post("/", response_model=AdminOut)
+    if not admin:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin not found")
+    return admin
+
+
+@router.post("/", response_model=AccountOut)
 async def create_admin(
-        admin: AdminCreate,
-        admin_service: Annotated[AdminService, Depends(get_admin_service)],
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
+        admin: AccountCreate,
+        account_service: AccountService = Depends(get_account_service),
+        current_owner: Optional[AccountSnapshot] = Depends(get_current_owner),
 ):
-    if current_owner:
-        return await admin_service.create(admin)
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    if not current_owner:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
 
+    account = await account_service.create_with_role(admin, "admin")
+    if not account:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="ADMIN_GROUP_ID is not configured")
+    return account
 
-@router.put("/{admin_id}", response_model=AdminOut)
+
+@router.put("/{admin_id}", response_model=AccountOut)
 async def update_admin(
         admin_id: int,
-        admin: AdminUpdate,
-        admin_service: Annotated[AdminService, Depends(get_admin_service)],
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
+        admin: AccountUpdate,
+        account_service: AccountService = Depends(get_account_service),
+        current_owner: Optional[AccountSnapshot] = Depends(get_current_owner),
 ):
-    if current_owner:
-        return await admin_service.update(admin_id, admin)
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    if not current_owner:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+
+    if not await account_service.get_by_id_by_role(admin_id, "admin"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin not found")
+    return await account_service.update(admin_id, admin)
 
 
-@router.delete("/{admin_id}", response_model=AdminOut)
+@router.delete("/{admin_id}", response_model=AccountOut)
 async def delete_admin(
         admin_id: int,
-        admin_service: Annotated[AdminService, Depends(get_admin_service)],
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
+        account_service: AccountService = Depends(get_account_service),
+        current_owner: Optional[AccountSnapshot] = Depends(get_current_owner),
 ):
-    if current_owner:
-        return await admin_service.delete(admin_id)
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    if not current_owner:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+
+    if not await account_service.get_by_id_by_role(admin_id, "admin"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin not found")
+    return await account_service.delete(admin_id)
 
 
-@router.post("/{admin_id}/companies/{company_id}", response_model=AdminOut)
+@router.post("/{admin_id}/companies/{company_id}", response_model=AccountOut)
 async def create_m2m_admin_company(
         admin_id: int,
         company_id: int,
-        admin_service: Annotated[AdminService, Depends(get_admin_service)],
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
+        account_service: AccountService = Depends(get_account_service),
+        current_owner: Optional[AccountSnapshot] = Depends(get_current_owner),
 ):
-    if current_owner:
-        return await admin_service.add_company_to_admin(admin_id, company_id)
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    if not current_owner:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+
+    if not await account_service.get_by_id_by_role(admin_id, "admin"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin not found")
+    admin = await account_service.add_group_to_account(admin_id, company_id)
+    if not admin:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
+    return admin
 
 
-@router.delete("/{admin_id}/companies/{company_id}", response_model=AdminOut)
+@router.delete("/{admin_id}/companies/{company_id}", response_model=AccountOut)
 async def remove_m2m_admin_company(
         admin_id: int,
         company_id: int,
-        admin_service: Annotated[AdminService, Depends(get_admin_service)],
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
+        account_service: AccountService = Depends(get_account_service),
+        current_owner: Optional[AccountSnapshot] = Depends(get_current_owner),
 ):
-    if current_owner:
-        return await admin_service.remove_company_from_admin(admin_id, company_id)
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    if not current_owner:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+
+    if not await account_service.get_by_id_by_role(admin_id, "admin"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin not found")
+    admin = await account_service.remove_group_from_account(admin_id, company_id)
+    if not admin:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
+    return admin
 
 
 @router.post("/login", response_model=Token)
 async def login_for_admin_access_token(
         form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-        admin_service: Annotated[AdminService, Depends(get_admin_service)],
+        account_service: AccountService = Depends(get_account_service),
 ):
-    admin = await admin_service.authenticate_admin(form_data.username, form_data.password)
-    if not admin:
+    admin = await account_service.authenticate_account(form_data.username, form_data.password)
+    if not admin or await account_service.get_role(admin) != "admin":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
-    access_token = await admin_service.create_admin_token(admin)
-    if not access_token:
+
+    access_token = await account_service.create_account_token(admin)
+    refresh_token = await account_service.create_account_refresh_token(admin)
+    if not access_token or not refresh_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
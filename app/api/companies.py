@@ -2,84 +2,85 @@ from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, status, Depends
 
-from app.dependencies.auth import get_current_owner, get_current_admin, get_current_user
-from app.schemas.admin import AdminOut
-from app.schemas.company import CompanyOut, CompanyCreate, CompanyUpdate
-from app.schemas.owner import OwnerOut
-from app.schemas.user import UserOut
-from app.dependencies.services import get_company_service
-from app.services.group_service import CompanyService
+from app.dependencies.auth import Principal, get_current_principal, get_current_owner
+from app.dependencies.services import get_group_service
+from app.schemas.group import GroupBase, GroupOut
+from app.services.group_service import GroupService
+from app.utils.account_cache import AccountSnapshot
 
 router = APIRouter(prefix="/companies", tags=["companies"])
 
 
-@router.get("/", response_model=List[CompanyOut])
+@router.get("/", response_model=List[GroupOut])
 async def get_all_companies(
-        company_service: CompanyService = Depends(get_company_service),
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
-        current_admin: Optional[AdminOut] = Depends(get_current_admin),
-        current_user: Optional[UserOut] = Depends(get_current_user),
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
 ):
-    if current_owner:
-        return await company_service.get_all()
-    if current_admin:
-        return await company_service.get_all_companies_for_admin(current_admin)
-    if current_user:
-        return await company_service.get_company_for_user(current_user)
+    if principal and principal.role == "owner":
+        return await group_service.get_all()
+    if principal:
+        return await group_service.get_all_groups_by_account(principal.account)
 
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
 
-@router.get("/{company_id}", response_model=CompanyOut)
+@router.get("/{company_id}", response_model=GroupOut)
 async def get_company_by_id(
         company_id: int,
-        company_service: CompanyService = Depends(get_company_service),
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
-        current_admin: Optional[AdminOut] = Depends(get_current_admin),
-        current_user: Optional[UserOut] = Depends(get_current_user),
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
 ):
-    if current_owner:
-        return await company_service.get_by_id(company_id)
-    if current_admin:
-        return await company_service.get_company_by_id_for_admin(company_id, current_admin)
-    if current_user:
-        return await company_service.get_company_for_user(current_user)
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    if principal.role == "owner":
+        company = await group_service.get_by_id(company_id)
+    else:
+        company = await group_service.get_group_by_id_by_account(company_id, principal.account)
+
+    if not company:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
+    return company
 
 
-@router.post("/", response_model=CompanyOut)
+@router.post("/", response_model=GroupOut)
 async def create_company(
-        company: CompanyCreate,
-        company_service: CompanyService = Depends(get_company_service),
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
+        company: GroupBase,
+        group_service: GroupService = Depends(get_group_service),
+        current_owner: Optional[AccountSnapshot] = Depends(get_current_owner),
 ):
     if current_owner:
-        return await company_service.create(company)
+        return await group_service.create(company)
 
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
 
-@router.put("/{company_id}", response_model=CompanyOut)
+@router.put("/{company_id}", response_model=GroupOut)
 async def update_company(
         company_id: int,
-        company: CompanyUpdate,
-        company_service: CompanyService = Depends(get_company_service),
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
+        company: GroupBase,
+        group_service: GroupService = Depends(get_group_service),
+        current_owner: Optional[AccountSnapshot] = Depends(get_current_owner),
 ):
-    if current_owner:
-        return await company_service.update(company_id, company)
+    if not current_owner:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    updated = await group_service.update(company_id, company)
+    if not updated:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
+    return updated
 
 
-@router.delete("/{company_id}", response_model=CompanyOut)
+@router.delete("/{company_id}", response_model=GroupOut)
 async def delete_company(
         company_id: int,
-        company_service: CompanyService = Depends(get_company_service),
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
+        group_service: GroupService = Depends(get_group_service),
+        current_owner: Optional[AccountSnapshot] = Depends(get_current_owner),
 ):
-    if current_owner:
-        return await company_service.delete(company_id)
+    if not current_owner:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    deleted = await group_service.delete(company_id)
+    if not deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
+    return deleted
@@ -1,54 +1,74 @@
 from typing import Annotated, List
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.params import Depends
 
 from app.dependencies.auth import get_current_owner
 from app.dependencies.services import get_config_service
-from app.schemas.config import ConfigOut, ConfigCreate, ConfigUpdate
-from app.schemas.owner import OwnerOut
+from app.schemas.config import ConfigBase, ConfigOut
 from app.services.config_service import ConfigService
+from app.utils.account_cache import AccountSnapshot
+from app.utils.etag import etag_matches, make_etag, not_modified
 
 router = APIRouter(prefix="/config", tags=["config"])
 
 
 @router.get("/", response_model=List[ConfigOut])
 async def get_all_configs(
+        request: Request,
+        response: Response,
         config_service: ConfigService = Depends(get_config_service),
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)] = None,
+        current_owner: Annotated[AccountSnapshot, Depends(get_current_owner)] = None,
 ):
-    if current_owner:
-        return await config_service.get_all()
-
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
-
-
-@router.get("/{owner_id}", response_model=ConfigOut)
+    if not current_owner:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+
+    configs = await config_service.get_all()
+    # config rows carry no version, so the ETag hashes the (small) payload and only saves the transfer
+    etag = make_etag(current_owner, request.url.query, jsonable_encoder(configs))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return configs
+
+
+@router.get("/{config_key}", response_model=ConfigOut)
 async def get_config_by_key(
         config_key: str,
+        request: Request,
+        response: Response,
         config_service: ConfigService = Depends(get_config_service),
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)] = None,
+        current_owner: Annotated[AccountSnapshot, Depends(get_current_owner)] = None,
 ):
-    if current_owner:
-        return await config_service.get_by_key(config_key)
+    if not current_owner:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
 
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    config = await config_service.get_by_key(config_key)
+    if not config:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Config not found")
+
+    etag = make_etag(current_owner, request.url.query, jsonable_encoder(config))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return config
 
 
 @router.post("/", response_model=ConfigOut)
 async def create_config(
-        owner: ConfigCreate,
+        config: ConfigBase,
         config_service: ConfigService = Depends(get_config_service),
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)] = None,
+        current_owner: Annotated[AccountSnapshot, Depends(get_current_owner)] = None,
 ):
     if current_owner:
-        return await config_service.create(owner)
+        return await config_service.create(config)
 
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -59,9 +79,9 @@ async def create_config(
 @router.put("/{config_key}", response_model=ConfigOut)
 async def update_config(
         config_key: str,
-        config: ConfigUpdate,
+        config: ConfigBase,
         config_service: ConfigService = Depends(get_config_service),
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)] = None,
+        current_owner: Annotated[AccountSnapshot, Depends(get_current_owner)] = None,
 ):
     if current_owner:
         return await config_service.update(config_key, config)
@@ -76,7 +96,7 @@ async def update_config(
 async def delete_config(
         config_key: str,
         config_service: ConfigService = Depends(get_config_service),
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)] = None,
+        current_owner: Annotated[AccountSnapshot, Depends(get_current_owner)] = None,
 ):
     if current_owner:
         return await config_service.delete(config_key)
@@ -0,0 +1,185 @@
+from typing import Optional
+
+from fastapi import APIRouter, Body, HTTPException, Request, Response, status, Depends
+
+from app.dependencies.auth import Principal, get_current_principal
+from app.dependencies.pagination import get_fields, get_page_params
+from app.dependencies.services import get_group_service
+from app.schemas.group import GroupBase, GroupOut, GroupUpsert
+from app.schemas.bulk import BulkCount, BulkIds, BulkPatch, BulkResult
+from app.schemas.page import Page
+from app.services.group_service import GroupService
+from app.utils.etag import etag_matches, make_etag, not_modified, projected
+from app.utils.pagination import PageParams
+
+router = APIRouter(prefix="/groups", tags=["groups"])
+
+
+@router.get("/", response_model=Page[GroupOut])
+async def get_all_groups(
+        request: Request,
+        response: Response,
+        page: PageParams = Depends(get_page_params),
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    if principal.role == "owner":
+        version = await group_service.get_version(page=page)
+    else:
+        version = await group_service.get_version_by_account(principal.account, page=page)
+    etag = make_etag(principal, request.url.query, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    if principal.role == "owner":
+        result = await group_service.get_page(page)
+    else:
+        result = await group_service.get_page_by_account(page, principal.account)
+    return projected(result, etag) if page.fields else result
+
+
+@router.get("/{group_id}", response_model=GroupOut)
+async def get_group_by_id(
+        group_id: int,
+        request: Request,
+        response: Response,
+        fields: tuple[str, ...] = Depends(get_fields),
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    if principal.role == "owner":
+        version = await group_service.get_version(item_id=group_id)
+    else:
+        version = await group_service.get_version_by_account(principal.account, item_id=group_id)
+    etag = make_etag(principal, request.url.query, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    if principal.role == "owner":
+        group = await group_service.get_by_id(group_id, fields=fields)
+    else:
+        group = await group_service.get_group_by_id_by_account(group_id, principal.account, fields=fields)
+
+    if not group:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    return projected(group, etag) if fields else group
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_groups(
+        items: list[GroupBase] = Body(..., min_length=1, max_length=1000),
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await group_service.bulk_create(items)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.put("/bulk", response_model=BulkResult)
+async def bulk_upsert_groups(
+        items: list[GroupUpsert] = Body(..., min_length=1, max_length=1000),
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await group_service.bulk_upsert(items)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_groups(
+        patch: BulkPatch,
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await group_service.bulk_update(patch.ids, patch.data)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.delete("/bulk", response_model=BulkResult)
+async def bulk_delete_groups(
+        bulk: BulkIds,
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await group_service.bulk_delete(bulk.ids)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.post("/{group_id}/accounts", response_model=BulkCount)
+async def add_group_accounts(
+        group_id: int,
+        bulk: BulkIds,
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal or principal.role != "owner":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    count = await group_service.add_accounts_to_group(group_id, bulk.ids)
+    if count is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error")
+    return BulkCount(count=count)
+
+
+@router.delete("/{group_id}/accounts", response_model=BulkCount)
+async def remove_group_accounts(
+        group_id: int,
+        bulk: BulkIds,
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal or principal.role != "owner":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    count = await group_service.remove_accounts_from_group(group_id, bulk.ids)
+    if count is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error")
+    return BulkCount(count=count)
+
+
+@router.post("/{group_id}/vms", response_model=BulkCount)
+async def add_group_vms(
+        group_id: int,
+        bulk: BulkIds,
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal or principal.role != "owner":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    count = await group_service.add_vms_to_group(group_id, bulk.ids)
+    if count is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error")
+    return BulkCount(count=count)
+
+
+@router.delete("/{group_id}/vms", response_model=BulkCount)
+async def remove_group_vms(
+        group_id: int,
+        bulk: BulkIds,
+        group_service: GroupService = Depends(get_group_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal or principal.role != "owner":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    count = await group_service.remove_vms_from_group(group_id, bulk.ids)
+    if count is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error")
+    return BulkCount(count=count)
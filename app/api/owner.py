@@ -3,114 +3,131 @@ from typing import Annotated, Optional, List
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.dependencies.services import get_owner_service
+from app.dependencies.services import get_account_service
 from app.dependencies.auth import get_current_owner
-from app.schemas.owner import OwnerOut, OwnerCreate, OwnerUpdate
+from app.schemas.account import AccountCreate, AccountOut, AccountUpdate
 from app.schemas.token import Token
-from app.services.owner_service import OwnerService
+from app.services.account_service import AccountService
+from app.utils.account_cache import AccountSnapshot
 
 router = APIRouter(prefix="/owner", tags=["owner"])
 
 
-@router.get("/profile", response_model=OwnerOut)
+@router.get("/profile", response_model=AccountOut)
 async def get_owner_profile(
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)],
+        current_owner: Annotated[Optional[AccountSnapshot], Depends(get_current_owner)],
+        account_service: AccountService = Depends(get_account_service),
 ):
     if current_owner is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    return current_owner
+    return await account_service.get_by_id(current_owner.id)
 
 
-@router.get("/", response_model=List[OwnerOut])
+@router.get("/", response_model=List[AccountOut])
 async def get_all_owners(
-        owner_service: OwnerService = Depends(get_owner_service),
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)] = None,
+        account_service: AccountService = Depends(get_account_service),
+        current_owner: Annotated[Optional[AccountSnapshot], Depends(get_current_owner)] = None,
 ):
     if not current_owner:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    return await owner_service.get_all()
+    return await account_service.get_all_by_role("owner")
 
 
-@router.get("/{owner_id}", response_model=OwnerOut)
+@router.get("/{owner_id}", response_model=AccountOut)
 async def get_owner_by_id(
         owner_id: int,
-        owner_service: OwnerService = Depends(get_owner_service),
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)] = None,
+        account_service: AccountService = Depends(get_account_service),
+        current_owner: Annotated[Optional[AccountSnapshot], Depends(get_current_owner)] = None,
 ):
     if not current_owner:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    return await owner_service.get_by_id(owner_id)
+
+    owner = await account_service.get_by_id_by_role(owner_id, "owner")
+    if not owner:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Owner not found")
+    return owner
 
 
-@router.post("/", response_model=OwnerOut)
+@router.post("/", response_model=AccountOut)
 async def create_owner(
-        owner: OwnerCreate,
-        owner_service: OwnerService = Depends(get_owner_service),
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)] = None,
+        owner: AccountCreate,
+        account_service: AccountService = Depends(get_account_service),
+        current_owner: Annotated[Optional[AccountSnapshot], Depends(get_current_owner)] = None,
 ):
     if not current_owner:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    return await owner_service.create(owner)
+
+    account = await account_service.create_with_role(owner, "owner")
+    if not account:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="OWNER_GROUP_ID is not configured")
+    return account
 
 
-@router.put("/{owner_id}", response_model=OwnerOut)
+@router.put("/{owner_id}", response_model=AccountOut)
 async def update_owner(
         owner_id: int,
-        owner: OwnerUpdate,
-        owner_service: OwnerService = Depends(get_owner_service),
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)] = None,
+        owner: AccountUpdate,
+        account_service: AccountService = Depends(get_account_service),
+        current_owner: Annotated[Optional[AccountSnapshot], Depends(get_current_owner)] = None,
 ):
     if not current_owner:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    return await owner_service.update(owner_id, owner)
 
+    if not await account_service.get_by_id_by_role(owner_id, "owner"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Owner not found")
+    return await account_service.update(owner_id, owner)
 
-@router.delete("/{owner_id}", response_model=OwnerOut)
+
+@router.delete("/{owner_id}", response_model=AccountOut)
 async def delete_owner(
         owner_id: int,
-        owner_service: OwnerService = Depends(get_owner_service),
-        current_owner: Annotated[OwnerOut, Depends(get_current_owner)] = None,
+        account_service: AccountService = Depends(get_account_service),
+        current_owner: Annotated[Optional[AccountSnapshot], Depends(get_current_owner)] = None,
 ):
     if not current_owner:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    return await owner_service.delete(owner_id)
+
+    if not await account_service.get_by_id_by_role(owner_id, "owner"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Owner not found")
+    return await account_service.delete(owner_id)
 
 
-@router.post("/login", response_model=Optional[Token])
+@router.post("/login", response_model=Token)
 async def login_for_owner_access_token(
         form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-        owner_service: OwnerService = Depends(get_owner_service),
+        account_service: AccountService = Depends(get_account_service),
 ):
-    owner = await owner_service.authenticate_owner(form_data.username, form_data.password)
-    if not owner:
+    owner = await account_service.authenticate_account(form_data.username, form_data.password)
+    if not owner or await account_service.get_role(owner) != "owner":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
 
-    access_token = await owner_service.create_owner_token(owner)
-    if not access_token:
+    access_token = await account_service.create_account_token(owner)
+    refresh_token = await account_service.create_account_refresh_token(owner)
+    if not access_token or not refresh_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
 
-    return {"access_token": access_token, "token_type": "Bearer"}
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, status, Depends
+
+from app.dependencies.auth import Principal, get_current_principal
+from app.dependencies.services import get_retention_service
+from app.schemas.bulk import BulkIds
+from app.services.retention_service import RetentionService
+
+router = APIRouter(prefix="/retention", tags=["retention"])
+
+
+@router.post("/run")
+async def run_retention(
+        dry_run: bool = True,
+        retention_service: RetentionService = Depends(get_retention_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await retention_service.run(dry_run=dry_run)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.post("/{table}/restore")
+async def restore_archived(
+        table: str,
+        bulk: BulkIds,
+        retention_service: RetentionService = Depends(get_retention_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal or principal.role != "owner":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    result = await retention_service.restore(table, bulk.ids)
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Database error")
+
+    restored, conflicts = result
+    return {"restored": restored, "conflicts": conflicts}
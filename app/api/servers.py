@@ -0,0 +1,105 @@
+from typing import Optional
+
+from fastapi import APIRouter, Body, HTTPException, Request, Response, status, Depends
+
+from app.dependencies.auth import Principal, get_current_principal
+from app.dependencies.pagination import get_fields, get_page_params
+from app.dependencies.services import get_server_service
+from app.schemas.bulk import BulkIds, BulkPatch, BulkResult
+from app.schemas.page import Page
+from app.schemas.server import ServerBase, ServerOut, ServerUpsert
+from app.services.server_service import ServerService
+from app.utils.etag import etag_matches, make_etag, not_modified, projected
+from app.utils.pagination import PageParams
+
+router = APIRouter(prefix="/servers", tags=["servers"])
+
+
+@router.get("/", response_model=Page[ServerOut])
+async def get_all_servers(
+        request: Request,
+        response: Response,
+        page: PageParams = Depends(get_page_params),
+        server_service: ServerService = Depends(get_server_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal or principal.role not in ("owner", "admin"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    etag = make_etag(principal.role, request.url.query, await server_service.get_version(page=page))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    result = await server_service.get_page(page)
+    return projected(result, etag) if page.fields else result
+
+
+@router.get("/{server_id}", response_model=ServerOut)
+async def get_server_by_id(
+        server_id: int,
+        request: Request,
+        response: Response,
+        fields: tuple[str, ...] = Depends(get_fields),
+        server_service: ServerService = Depends(get_server_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal or principal.role not in ("owner", "admin"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    etag = make_etag(principal.role, request.url.query, await server_service.get_version(item_id=server_id))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    server = await server_service.get_by_id(server_id, fields=fields)
+    if not server:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Server not found")
+    return projected(server, etag) if fields else server
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_servers(
+        items: list[ServerBase] = Body(..., min_length=1, max_length=1000),
+        server_service: ServerService = Depends(get_server_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await server_service.bulk_create(items)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.put("/bulk", response_model=BulkResult)
+async def bulk_upsert_servers(
+        items: list[ServerUpsert] = Body(..., min_length=1, max_length=1000),
+        server_service: ServerService = Depends(get_server_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await server_service.bulk_upsert(items)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_servers(
+        patch: BulkPatch,
+        server_service: ServerService = Depends(get_server_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await server_service.bulk_update(patch.ids, patch.data)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.delete("/bulk", response_model=BulkResult)
+async def bulk_delete_servers(
+        bulk: BulkIds,
+        server_service: ServerService = Depends(get_server_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await server_service.bulk_delete(bulk.ids)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
@@ -1,91 +1,117 @@
-from typing import List, Annotated, Optional
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Request, Response, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.dependencies.auth import get_current_user, get_current_owner, get_current_admin
-from app.dependencies.services import get_user_service
-from app.schemas.admin import AdminOut
-from app.schemas.owner import OwnerOut
+from app.dependencies.auth import Principal, get_current_principal
+from app.dependencies.pagination import get_page_params
+from app.dependencies.services import get_account_service
+from app.schemas.account import AccountCreate, AccountOut, AccountUpdate
+from app.schemas.page import Page
 from app.schemas.token import Token
-from app.schemas.user import UserOut, UserUpdate, UserCreate
-from app.services.user_service import UserService
+from app.services.account_service import AccountService
+from app.utils.etag import etag_matches, make_etag, not_modified, projected
+from app.utils.pagination import PageParams
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("/profile", response_model=UserOut)
+@router.get("/profile", response_model=AccountOut)
 async def get_user_profile(
-        current_user: Annotated[UserOut, Depends(get_current_user)],
+        request: Request,
+        response: Response,
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
 ):
-    if current_user is None:
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
 
-    return current_user
+    version = await account_service.get_version(item_id=principal.account.id)
+    etag = make_etag(principal, request.url.query, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
 
+    return await account_service.get_by_id(principal.account.id)
 
-@router.get("/", response_model=List[UserOut])
+
+@router.get("/", response_model=Page[AccountOut])
 async def get_all_users(
-        user_service: UserService = Depends(get_user_service),
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
-        current_admin: Optional[AdminOut] = Depends(get_current_admin),
-        current_user: Optional[UserOut] = Depends(get_current_user),
+        request: Request,
+        response: Response,
+        page: PageParams = Depends(get_page_params),
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
 ):
-    if current_owner:
-        return await user_service.get_all()
-
-    if current_admin:
-        return await user_service.get_all_users_for_admin(current_admin)
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
 
-    if current_user:
-        return await user_service.get_all_users_for_user(current_user)
+    if principal.role == "owner":
+        version = await account_service.get_version(page=page)
+    else:
+        version = await account_service.get_version_by_account(principal.account, page=page)
+    etag = make_etag(principal, request.url.query, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
 
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    if principal.role == "owner":
+        result = await account_service.get_page(page)
+    else:
+        result = await account_service.get_page_by_account(page, principal.account)
+    return projected(result, etag) if page.fields else result
 
 
-@router.get("/{user_id}", response_model=UserOut)
+@router.get("/{user_id}", response_model=AccountOut)
 async def get_user_by_id(
         user_id: int,
-        user_service: UserService = Depends(get_user_service),
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
-        current_admin: Optional[AdminOut] = Depends(get_current_admin),
-        current_user: Optional[UserOut] = Depends(get_current_user),
+        request: Request,
+        response: Response,
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
 ):
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
 
-    if current_owner:
-        return await user_service.get_by_id(user_id)
-
-    if current_admin:
-        return await user_service.get_user_by_id_for_admin(user_id, current_admin)
+    if principal.role == "owner":
+        version = await account_service.get_version(item_id=user_id)
+    else:
+        version = await account_service.get_version_by_account(principal.account, item_id=user_id)
+    etag = make_etag(principal, request.url.query, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
 
-    if current_user:
-        return await user_service.get_user_by_id_for_user(user_id, current_user)
+    if principal.role == "owner":
+        account = await account_service.get_by_id(user_id)
+    else:
+        account = await account_service.get_account_by_id_by_account(user_id, principal.account)
 
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    if not account:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+    return account
 
 
-@router.post("/", response_model=UserOut)
+@router.post("/", response_model=AccountOut)
 async def create_user(
-        user: UserCreate,
-        user_service: UserService = Depends(get_user_service),
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
-        current_admin: Optional[AdminOut] = Depends(get_current_admin),
+        user: AccountCreate,
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
 ):
+    if principal and principal.role == "owner":
+        return await account_service.create(user)
 
-    if current_owner:
-        return await user_service.create(user)
-
-    if current_admin:
-        return await user_service.create_by_admin(user, current_admin)
+    if principal and principal.role == "admin":
+        return await account_service.create_by_account(user, principal.account)
 
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -93,67 +119,70 @@ async def create_user(
     )
 
 
-@router.put("/{user_id}", response_model=UserOut)
+@router.put("/{user_id}", response_model=AccountOut)
 async def update_user(
         user_id: int,
-        user: UserUpdate,
-        user_service: UserService = Depends(get_user_service),
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
-        current_admin: Optional[AdminOut] = Depends(get_current_admin),
+        user: AccountUpdate,
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
 ):
+    if principal and principal.role == "owner":
+        account = await account_service.update(user_id, user)
+    elif principal and principal.role == "admin":
+        account = await account_service.update_by_account(user_id, user, principal.account)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
 
-
-    if current_owner:
-        return await user_service.update(user_id, user)
-
-    if current_admin:
-        return await user_service.update_by_admin(user_id, user, current_admin)
-
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    if not account:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+    return account
 
 
-@router.delete("/{user_id}", response_model=UserOut)
+@router.delete("/{user_id}", response_model=AccountOut)
 async def delete_user(
         user_id: int,
-        user_service: UserService = Depends(get_user_service),
-        current_owner: Optional[OwnerOut] = Depends(get_current_owner),
-        current_admin: Optional[AdminOut] = Depends(get_current_admin),
+        account_service: AccountService = Depends(get_account_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
 ):
-    if current_owner:
-        return await user_service.delete(user_id)
-
-    if current_admin:
-        return await user_service.delete_by_admin(user_id, current_admin)
+    if principal and principal.role == "owner":
+        account = await account_service.delete(user_id)
+    elif principal and principal.role == "admin":
+        account = await account_service.delete_by_account(user_id, principal.account)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
 
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid token",
-    )
+    if not account:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found")
+    return account
 
 
 @router.post("/login", response_model=Token)
 async def login_for_user_access_token(
         form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-        user_service: UserService = Depends(get_user_service),
+        account_service: AccountService = Depends(get_account_service),
 ):
 
-    user = await user_service.authenticate_user(form_data.username, form_data.password)
+    account = await account_service.authenticate_account(form_data.username, form_data.password)
 
-    if not user:
+    if not account:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
 
-    access_token = await user_service.create_user_token(user)
+    access_token = await account_service.create_account_token(account)
+    refresh_token = await account_service.create_account_refresh_token(account)
 
-    if not access_token:
+    if not access_token or not refresh_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
 
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
@@ -0,0 +1,135 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Body, HTTPException, Request, Response, status, Depends
+
+from app.dependencies.auth import Principal, get_current_principal
+from app.dependencies.pagination import get_fields, get_page_params
+from app.dependencies.services import get_vm_service
+from app.schemas.vm import VMCapacity, VMCreate, VMOut, VMUpsert
+from app.schemas.bulk import BulkIds, BulkPatch, BulkResult
+from app.schemas.page import Page
+from app.services.vm_service import VMService
+from app.utils.etag import etag_matches, make_etag, not_modified, projected
+from app.utils.pagination import PageParams
+
+router = APIRouter(prefix="/vms", tags=["vms"])
+
+
+@router.get("/", response_model=Page[VMOut])
+async def get_all_vms(
+        request: Request,
+        response: Response,
+        page: PageParams = Depends(get_page_params),
+        vm_service: VMService = Depends(get_vm_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    if principal.role == "owner":
+        version = await vm_service.get_version(page=page)
+    else:
+        version = await vm_service.get_version_by_account(principal.account, page=page)
+    etag = make_etag(principal, request.url.query, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    if principal.role == "owner":
+        result = await vm_service.get_page(page)
+    else:
+        result = await vm_service.get_page_by_account(page, principal.account)
+    return projected(result, etag) if page.fields else result
+
+
+@router.get("/capacity", response_model=list[VMCapacity])
+async def get_vm_capacity(
+        by: Optional[Literal["server", "group"]] = None,
+        vm_service: VMService = Depends(get_vm_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    if principal.role == "owner":
+        return await vm_service.get_capacity(by)
+    return await vm_service.get_capacity_by_account(principal.account, by)
+
+
+@router.get("/{vm_id}", response_model=VMOut)
+async def get_vm_by_id(
+        vm_id: int,
+        request: Request,
+        response: Response,
+        fields: tuple[str, ...] = Depends(get_fields),
+        vm_service: VMService = Depends(get_vm_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if not principal:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    if principal.role == "owner":
+        version = await vm_service.get_version(item_id=vm_id)
+    else:
+        version = await vm_service.get_version_by_account(principal.account, item_id=vm_id)
+    etag = make_etag(principal, request.url.query, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    if principal.role == "owner":
+        vm = await vm_service.get_by_id(vm_id, fields=fields)
+    else:
+        vm = await vm_service.get_vm_by_id_by_account(vm_id, principal.account, fields=fields)
+
+    if not vm:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="VM not found")
+    return projected(vm, etag) if fields else vm
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_vms(
+        items: list[VMCreate] = Body(..., min_length=1, max_length=1000),
+        vm_service: VMService = Depends(get_vm_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await vm_service.bulk_create(items)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.put("/bulk", response_model=BulkResult)
+async def bulk_upsert_vms(
+        items: list[VMUpsert] = Body(..., min_length=1, max_length=1000),
+        vm_service: VMService = Depends(get_vm_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await vm_service.bulk_upsert(items)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_vms(
+        patch: BulkPatch,
+        vm_service: VMService = Depends(get_vm_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await vm_service.bulk_update(patch.ids, patch.data)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+
+@router.delete("/bulk", response_model=BulkResult)
+async def bulk_delete_vms(
+        bulk: BulkIds,
+        vm_service: VMService = Depends(get_vm_service),
+        principal: Optional[Principal] = Depends(get_current_principal),
+):
+    if principal and principal.role == "owner":
+        return await vm_service.bulk_delete(bulk.ids)
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
@@ -1,15 +1,52 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from fastapi import Request
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
 from app.models import Base
 from app.core.settings import settings
+from app.utils.query_stats import install_query_stats
 
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=True,
-    pool_size=20,
-    max_overflow=10,
-    pool_pre_ping=True
-)
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def get_engine_options(url: str) -> dict:
+    options = {
+        "echo": settings.DB_ECHO,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    database_url = make_url(url)
+    # in-memory SQLite runs on a single StaticPool connection, which takes no sizing options
+    if database_url.get_backend_name() == "sqlite" and database_url.database in (None, "", ":memory:"):
+        return options
+    options.update({
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    })
+    return options
+
+
+def make_engine(url: str) -> AsyncEngine:
+    async_engine = create_async_engine(url, **get_engine_options(url))
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+    return async_engine
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, _connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+install_query_stats()
+
+engine_options = get_engine_options(settings.database_url)
+
+engine = make_engine(settings.database_url)
+
+replica_engine = make_engine(settings.replica_database_url) if settings.replica_database_url else None
 
 
 AsyncSessionLocal = async_sessionmaker(
@@ -19,12 +56,22 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+ReadSessionLocal = async_sessionmaker(
+    bind=replica_engine if replica_engine is not None else engine,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 
-async def get_db() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
+async def get_db(request: Request) -> AsyncSession:
+    read_only = request.method in READ_ONLY_METHODS
+    session_factory = ReadSessionLocal if read_only else AsyncSessionLocal
+    async with session_factory() as session:
         try:
             yield session
-            await session.commit()
+            if not read_only:
+                await session.commit()
         except Exception as e:
             await session.rollback()
             raise
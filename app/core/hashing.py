@@ -0,0 +1,130 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from passlib.context import CryptContext
+
+from app.core.settings import settings
+from app.utils.logger import logger
+
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _hash(password: str, rounds: Optional[int] = None) -> str:
+    if rounds is None:
+        return pwd_context.hash(password)
+    return pwd_context.handler("bcrypt").using(rounds=rounds).hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    def __init__(self, mode: str, workers: int, queue_size: int, retry_after: int):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor mode: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self._executor: Optional[Executor] = None
+        self.rounds: Optional[int] = None
+        self.in_flight = 0
+        self.rejected = 0
+        self.completed = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.in_flight >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise PasswordHasherBusy(self.retry_after)
+
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.in_flight -= 1
+            elapsed = time.perf_counter() - started
+            self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password, self.rounds)
+
+    def needs_update(self, hashed_password: str) -> bool:
+        return pwd_context.needs_update(hashed_password)
+
+    def set_rounds(self, rounds: int) -> None:
+        self.rounds = rounds
+        # no upper bound: stronger hashes from a faster host must not be downgraded on login
+        pwd_context.update(
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+        )
+
+    async def calibrate(self, target_ms: int, min_rounds: int, max_rounds: int) -> int:
+        loop = asyncio.get_running_loop()
+        rounds = min_rounds
+        for candidate in range(min_rounds, max_rounds + 1):
+            started = time.perf_counter()
+            await loop.run_in_executor(self._get_executor(), _hash, "calibration", candidate)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.info(f"PASSWORD_HASHER: bcrypt rounds={candidate} took {elapsed_ms:.0f} ms")
+            if elapsed_ms > target_ms:
+                break
+            rounds = candidate
+
+        self.set_rounds(rounds)
+        logger.info(f"PASSWORD_HASHER: Calibrated bcrypt rounds={rounds} for target {target_ms} ms")
+        return rounds
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "rounds": self.rounds,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.workers),
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "avg_ms": round(self.total_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_EXECUTOR,
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_QUEUE_SIZE,
+    settings.PASSWORD_HASH_RETRY_AFTER,
+)
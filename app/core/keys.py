@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from cryptography.hazmat.primitives import serialization
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+from app.core.settings import settings
+
+
+ASYMMETRIC_ALGORITHMS = {
+    "RS256": RSAAlgorithm,
+    "RS384": RSAAlgorithm,
+    "RS512": RSAAlgorithm,
+    "EdDSA": OKPAlgorithm,
+}
+
+
+@dataclass(frozen=True)
+class PublicKey:
+    kid: str
+    key: Any
+
+
+class KeyRing:
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: str,
+        private_key: Any = None,
+        key_id: str = "",
+        public_keys: Optional[list[PublicKey]] = None,
+    ):
+        self.algorithm = algorithm or "HS256"
+        self.secret_key = secret_key
+        self.private_key = private_key
+        self.key_id = key_id
+        self.public_keys = {key.kid: key for key in public_keys or []}
+
+        if self.is_asymmetric:
+            if private_key is None or not key_id:
+                raise ValueError(f"{self.algorithm} requires JWT_PRIVATE_KEY_FILE and JWT_KEY_ID")
+            self.public_keys[key_id] = PublicKey(key_id, private_key.public_key())
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    @property
+    def signing_key(self) -> Any:
+        return self.private_key if self.is_asymmetric else self.secret_key
+
+    @property
+    def headers(self) -> Optional[dict]:
+        return {"kid": self.key_id} if self.is_asymmetric else None
+
+    def verification_key(self, kid: Optional[str]) -> Optional[Any]:
+        if not self.is_asymmetric:
+            return self.secret_key
+        public_key = self.public_keys.get(kid)
+        return public_key.key if public_key else None
+
+    def jwks(self) -> dict:
+        if not self.is_asymmetric:
+            return {"keys": []}
+
+        jwk_algorithm = ASYMMETRIC_ALGORITHMS[self.algorithm]
+        keys = []
+        for public_key in self.public_keys.values():
+            jwk = jwk_algorithm.to_jwk(public_key.key, as_dict=True)
+            jwk.update({"kid": public_key.kid, "use": "sig", "alg": self.algorithm})
+            keys.append(jwk)
+        return {"keys": keys}
+
+    @classmethod
+    def from_settings(cls) -> "KeyRing":
+        private_key = None
+        if settings.JWT_PRIVATE_KEY_FILE:
+            private_key = serialization.load_pem_private_key(
+                Path(settings.JWT_PRIVATE_KEY_FILE).read_bytes(), password=None
+            )
+
+        public_keys = []
+        for entry in filter(None, (item.strip() for item in settings.JWT_PUBLIC_KEY_FILES.split(","))):
+            kid, _, path = entry.partition("=")
+            public_keys.append(PublicKey(kid.strip(), serialization.load_pem_public_key(Path(path.strip()).read_bytes())))
+
+        return cls(
+            algorithm=settings.ALGORITHM,
+            secret_key=settings.SECRET_KEY,
+            private_key=private_key,
+            key_id=settings.JWT_KEY_ID,
+            public_keys=public_keys,
+        )
+
+
+key_ring = KeyRing.from_settings()
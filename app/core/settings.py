@@ -1,23 +1,69 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    DATABASE_URL: str = ""
+    DB_CREATE_TABLES: bool = False
     DB_HOST: str = ""
     DB_PORT: int = 3000
     DB_USER: str = ""
     DB_PASS: str = ""
     DB_NAME: str = ""
+    DB_REPLICA_HOST: str = ""
+    DB_REPLICA_PORT: int = 0
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = True
+    DB_QUERY_STATS: bool = False
+    DB_REPEATED_QUERY_THRESHOLD: int = 3
 
     SECRET_KEY: str = ""
     ALGORITHM: str = ""
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 720
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_MINUTES: int = 10080
+    JWT_PRIVATE_KEY_FILE: str = ""
+    JWT_KEY_ID: str = ""
+    JWT_PUBLIC_KEY_FILES: str = ""
+    TOKEN_CACHE_SIZE: int = 10000
+    ACCOUNT_CACHE_SIZE: int = 10000
+    ACCOUNT_CACHE_TTL_SECONDS: int = 300
+    OWNER_GROUP_ID: int = 0
+    ADMIN_GROUP_ID: int = 0
+
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_HASH_RETRY_AFTER: int = 1
+    PASSWORD_HASH_ROUNDS: int = 0
+    PASSWORD_HASH_TARGET_MS: int = 250
+    PASSWORD_HASH_MIN_ROUNDS: int = 10
+    PASSWORD_HASH_MAX_ROUNDS: int = 16
+
+    RETENTION_DAYS: int = 30
+    RETENTION_MODE: Literal["archive", "purge"] = "archive"
+    RETENTION_BATCH_SIZE: int = 500
+    RETENTION_INTERVAL_SECONDS: int = 0
 
     DEBUG: bool = False
 
     @property
     def database_url(self):
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return f"mysql+asyncmy://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def replica_database_url(self):
+        if not self.DB_REPLICA_HOST or self.DATABASE_URL:
+            return None
+        port = self.DB_REPLICA_PORT or self.DB_PORT
+        return f"mysql+asyncmy://{self.DB_USER}:{self.DB_PASS}@{self.DB_REPLICA_HOST}:{port}/{self.DB_NAME}"
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
@@ -1,58 +1,58 @@
+from dataclasses import dataclass
 from typing import Optional
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 
-from app.models import Owner, Admin, User
+from app.services.account_service import AccountService
 from app.services.auth_service import AuthService
-from app.services.user_service import UserService
-from app.services.admin_service import AdminService
-from app.services.owner_service import OwnerService
-from app.dependencies.services import get_auth_service, get_user_service, get_owner_service, get_admin_service
+from app.dependencies.services import get_auth_service, get_account_service
+from app.utils.account_cache import AccountSnapshot
 
 
-oauth2_user_scheme = OAuth2PasswordBearer(tokenUrl="users/login", auto_error=False)
-oauth2_admin_scheme = OAuth2PasswordBearer(tokenUrl="admins/login", auto_error=False)
-oauth2_owner_scheme = OAuth2PasswordBearer(tokenUrl="owner/login", auto_error=False)
+ROLES = ("owner", "admin", "user")
 
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login", auto_error=False)
 
-async def get_current_user(
-    token: Optional[str] = Depends(oauth2_user_scheme),
-    auth_service: AuthService = Depends(get_auth_service),
-    user_service: UserService = Depends(get_user_service)
-) -> Optional[User]:
-    if not token:
-        return None
 
-    payload = await auth_service.verify_token(token)
-    if payload.get("role") != "user":
-        return None
+@dataclass(frozen=True)
+class Principal:
+    role: str
+    account: AccountSnapshot
 
-    return await user_service.get_by_username(payload.get("sub"))
 
-async def get_current_admin(
-    token: Optional[str] = Depends(oauth2_admin_scheme),
+async def get_current_principal(
+    token: Optional[str] = Depends(oauth2_scheme),
     auth_service: AuthService = Depends(get_auth_service),
-    admin_service: AdminService = Depends(get_admin_service)
-) -> Optional[Admin]:
+    account_service: AccountService = Depends(get_account_service)
+) -> Optional[Principal]:
     if not token:
         return None
 
-    payload = await auth_service.verify_token(token)
-    if payload.get("role") != "admin":
+    payload = await auth_service.verify_access_token(token)
+    if not payload or payload.get("role") not in ROLES:
         return None
 
-    return await admin_service.get_by_username(payload.get("sub"))
-
-async def get_current_owner(
-    token: Optional[str] = Depends(oauth2_owner_scheme),
-    auth_service: AuthService = Depends(get_auth_service),
-    owner_service: OwnerService = Depends(get_owner_service)
-) -> Optional[Owner]:
-    if not token:
+    account = await account_service.get_snapshot_by_username(payload.get("sub"))
+    if not account or account.deleted or payload.get("aid", account.id) != account.id:
         return None
 
-    payload = await auth_service.verify_token(token)
-    if payload.get("role") != "owner":
+    # the role claim was derived from group membership; a changed membership needs a refresh
+    if payload.get("gv", account.group_version) != account.group_version:
         return None
 
-    return await owner_service.get_by_username(payload.get("sub"))
+    return Principal(role=payload["role"], account=account)
+
+async def get_current_user(
+    principal: Optional[Principal] = Depends(get_current_principal)
+) -> Optional[AccountSnapshot]:
+    return principal.account if principal and principal.role == "user" else None
+
+async def get_current_admin(
+    principal: Optional[Principal] = Depends(get_current_principal)
+) -> Optional[AccountSnapshot]:
+    return principal.account if principal and principal.role == "admin" else None
+
+async def get_current_owner(
+    principal: Optional[Principal] = Depends(get_current_principal)
+) -> Optional[AccountSnapshot]:
+    return principal.account if principal and principal.role == "owner" else None
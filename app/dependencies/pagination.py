@@ -0,0 +1,28 @@
+from typing import Optional
+
+from fastapi import Depends, Query, Request
+
+from app.utils.pagination import PageParams
+
+RESERVED_PARAMS = {"limit", "cursor", "sort", "fields"}
+
+
+async def get_fields(fields: Optional[str] = None) -> tuple[str, ...]:
+    if not fields:
+        return ()
+    return tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+
+
+async def get_page_params(
+        request: Request,
+        limit: int = Query(50, ge=1, le=500),
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        fields: tuple[str, ...] = Depends(get_fields),
+) -> PageParams:
+    filters = tuple(
+        (key, tuple(request.query_params.getlist(key)))
+        for key in dict.fromkeys(request.query_params.keys())
+        if key not in RESERVED_PARAMS
+    )
+    return PageParams(limit=limit, cursor=cursor, sort=sort, filters=filters, fields=fields)
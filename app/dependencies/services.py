@@ -3,41 +3,51 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
-from app.services.admin_service import AdminService
+from app.services.account_service import AccountService
 from app.services.auth_service import AuthService
-from app.services.group_service import CompanyService
+from app.services.group_service import GroupService
 from app.services.config_service import ConfigService
-from app.services.owner_service import OwnerService
-from app.services.user_service import UserService
+from app.services.retention_service import RetentionService
+from app.services.server_service import ServerService
+from app.services.version_service import VersionService
+from app.services.vm_service import VMService
 
 
 async def get_auth_service() -> AuthService:
     return AuthService()
 
-async def get_user_service(
-    db: Annotated[AsyncSession, Depends(get_db)],
-    auth_service: Annotated[AuthService, Depends(get_auth_service)]
-) -> UserService:
-    return UserService(db, auth_service)
-
-async def get_admin_service(
+async def get_account_service(
         db: Annotated[AsyncSession, Depends(get_db)],
         auth_service: Annotated[AuthService, Depends(get_auth_service)]
-) -> AdminService:
-    return AdminService(db, auth_service)
+) -> AccountService:
+    return AccountService(db, auth_service)
 
-async def get_company_service(
+async def get_group_service(
         db: Annotated[AsyncSession, Depends(get_db)]
-) -> CompanyService:
-    return CompanyService(db)
+) -> GroupService:
+    return GroupService(db)
 
-async def get_owner_service(
-        db: Annotated[AsyncSession, Depends(get_db)],
-        auth_service: Annotated[AuthService, Depends(get_auth_service)]
-) -> OwnerService:
-    return OwnerService(db, auth_service)
+async def get_server_service(
+        db: Annotated[AsyncSession, Depends(get_db)]
+) -> ServerService:
+    return ServerService(db)
+
+async def get_vm_service(
+        db: Annotated[AsyncSession, Depends(get_db)]
+) -> VMService:
+    return VMService(db)
+
+async def get_version_service(
+        db: Annotated[AsyncSession, Depends(get_db)]
+) -> VersionService:
+    return VersionService(db)
 
 async def get_config_service(
         db: Annotated[AsyncSession, Depends(get_db)]
 ) -> ConfigService:
-    return ConfigService(db)
\ No newline at end of file
+    return ConfigService(db)
+
+async def get_retention_service(
+        db: Annotated[AsyncSession, Depends(get_db)]
+) -> RetentionService:
+    return RetentionService(db)
@@ -13,30 +13,77 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import asyncio
 import json
 import subprocess
 from contextlib import asynccontextmanager
-from typing import Annotated
+from typing import Annotated, List, Optional
 
-from fastapi import FastAPI, Header, HTTPException, Depends
+from fastapi import FastAPI, Header, HTTPException, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.api.accounts import router as accounts_router
 from app.api.admins import router as admins_router
 from app.api.companies import router as companies_router
 from app.api.users import router as users_router
 from app.api.owner import router as owner_router
 from app.api.config import router as config_router
-from app.dependencies.services import get_auth_service
-
+from app.api.groups import router as groups_router
+from app.api.servers import router as servers_router
+from app.api.vms import router as vms_router
+from app.api.retention import router as retention_router
+from app.dependencies.services import get_account_service, get_auth_service
+from app.schemas.token import RefreshRequest, Token, TokenBatch, TokenCheckResult
+
+from app.services.account_service import AccountService
 from app.services.auth_service import AuthService
+from app.services.retention_service import RetentionService
 
+from app.core.db import AsyncSessionLocal, create_tables, engine, engine_options, replica_engine
+from app.core.hashing import PasswordHasherBusy, password_hasher
+from app.core.keys import key_ring
 from app.core.settings import settings
+from app.utils.account_cache import account_cache
+from app.utils.logger import logger
+from app.utils.retention import retention_progress
+from app.utils.revocation import revocation_list
+from app.utils.pagination import InvalidQuery
+from app.utils.query_stats import QueryStatsMiddleware, compiled_cache_stats
+from app.utils.token_cache import token_cache
+
+
+async def run_retention_periodically():
+    while True:
+        await asyncio.sleep(settings.RETENTION_INTERVAL_SECONDS)
+        try:
+            async with AsyncSessionLocal() as session:
+                await RetentionService(session).run()
+        except Exception as e:
+            logger.error(f"RETENTION_SERVICE: Scheduled run failed: {e}")
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
+    if settings.PASSWORD_HASH_ROUNDS:
+        password_hasher.set_rounds(settings.PASSWORD_HASH_ROUNDS)
+    else:
+        await password_hasher.calibrate(
+            settings.PASSWORD_HASH_TARGET_MS,
+            settings.PASSWORD_HASH_MIN_ROUNDS,
+            settings.PASSWORD_HASH_MAX_ROUNDS,
+        )
+    if settings.DB_CREATE_TABLES:
+        await create_tables()
+    logger.info(f"DB: {engine.dialect.name} engine options {engine_options}, read replica {'on' if replica_engine is not None else 'off'}")
+    retention_task = None
+    if settings.RETENTION_INTERVAL_SECONDS > 0:
+        retention_task = asyncio.create_task(run_retention_periodically())
     print("Server started!")
     yield
+    if retention_task is not None:
+        retention_task.cancel()
+    password_hasher.shutdown()
     print("Server stopped!")
 
 
@@ -51,11 +98,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+if settings.DB_QUERY_STATS or settings.DEBUG:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        repeated_threshold=settings.DB_REPEATED_QUERY_THRESHOLD,
+        expose_headers=settings.DEBUG,
+    )
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(_request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many concurrent logins, try again later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(InvalidQuery)
+async def invalid_query_handler(_request: Request, exc: InvalidQuery):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": str(exc)},
+    )
+
+
 app.include_router(admins_router)
 app.include_router(companies_router)
 app.include_router(users_router)
 app.include_router(owner_router)
 app.include_router(config_router)
+app.include_router(accounts_router)
+app.include_router(groups_router)
+app.include_router(servers_router)
+app.include_router(vms_router)
+app.include_router(retention_router)
 
 
 @app.get("/")
@@ -74,7 +152,56 @@ async def check_token(auth_service: Annotated[AuthService, Depends(get_auth_serv
         raise HTTPException(status_code=401, detail="Invalid authorization header")
 
     token = authorization.split(" ")[1]
-    return await auth_service.verify_token(token)
+    return await auth_service.verify_access_token(token)
+
+
+@app.post("/check/batch", response_model=List[TokenCheckResult])
+async def check_tokens(batch: TokenBatch,
+                       auth_service: Annotated[AuthService, Depends(get_auth_service)]):
+    results = await auth_service.verify_access_tokens(batch.tokens)
+    return [TokenCheckResult(payload=payload, error=error) for payload, error in results]
+
+
+@app.post("/refresh", response_model=Token)
+async def refresh_token(body: RefreshRequest,
+                        account_service: Annotated[AccountService, Depends(get_account_service)]):
+    tokens = await account_service.refresh_tokens(body.refresh_token)
+    if not tokens:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    access_token, new_refresh_token = tokens
+    return {"access_token": access_token, "refresh_token": new_refresh_token, "token_type": "bearer"}
+
+
+@app.post("/revoke")
+async def revoke_token(auth_service: Annotated[AuthService, Depends(get_auth_service)],
+                       body: Optional[RefreshRequest] = None,
+                       authorization: str = Header(default=None)):
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Invalid authorization header")
+
+    if not await auth_service.revoke_token(authorization.split(" ")[1]):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if body:
+        await auth_service.revoke_token(body.refresh_token)
+    return {"revoked": True}
+
+
+@app.get("/.well-known/jwks.json")
+async def get_jwks():
+    return key_ring.jwks()
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return {
+        "token_cache": token_cache.stats(),
+        "account_cache": account_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "revocation_list": revocation_list.stats(),
+        "retention": retention_progress.stats(),
+        "sql_compiled_cache": compiled_cache_stats.stats(),
+    }
 
 
 @app.get("/view_vm_json.ps1")
@@ -9,3 +9,4 @@ from app.models.account import Account
 from app.models.group import Group
 from app.models.server import Server
 from app.models.vm import VM
+from app.models.archive import archive_tables
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 
 from app.models import Base
@@ -7,21 +7,28 @@ from app.models.group import m2m_group_account
 
 class Account(Base):
     __tablename__ = 'accounts'
+    __table_args__ = (
+        Index('ix_accounts_deleted_id', 'deleted', 'id'),
+        Index('ix_accounts_deleted_updated_at', 'deleted', 'updated_at'),
+        Index('ix_accounts_deleted_version', 'deleted', 'version'),
+        Index('ix_accounts_username_deleted', 'username', 'deleted'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
     deleted = Column(Boolean, default=False)
+    version = Column(Integer, nullable=False, default=0, server_default='0')
 
     username = Column(String(50), unique=True, nullable=False)
     hashed_password = Column(String(60), nullable=False)
-    surname = Column(String(100), nullable=False, default='')
+    surname = Column(String(100), nullable=False, default='', index=True)
     name = Column(String(100), nullable=False, default='')
     middlename = Column(String(100), nullable=False, default='')
-    department = Column(String(100), nullable=False, default='')
+    department = Column(String(100), nullable=False, default='', index=True)
     phone = Column(String(20), nullable=False, default='')
     cellular = Column(String(20), nullable=False, default='')
-    post = Column(String(100), nullable=False, default='')
+    post = Column(String(100), nullable=False, default='', index=True)
     description = Column(Text, nullable=False, default='')
 
     groups = relationship("Group", secondary=m2m_group_account, back_populates="accounts")
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, DateTime, Table
+
+from app.models import Base
+from app.models.account import Account
+from app.models.group import Group, m2m_group_account, m2m_group_vm
+from app.models.server import Server
+from app.models.version import Version
+from app.models.vm import VM
+
+
+def archive_table(table: Table) -> Table:
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable, autoincrement=False)
+        for column in table.c
+    ]
+    return Table(
+        f"archive_{table.name}",
+        Base.metadata,
+        *columns,
+        Column("archived_at", DateTime, nullable=False, index=True),
+    )
+
+
+archive_tables = {
+    table.name: archive_table(table)
+    for table in (
+        VM.__table__,
+        Account.__table__,
+        Group.__table__,
+        Server.__table__,
+        Version.__table__,
+        m2m_group_account,
+        m2m_group_vm,
+    )
+}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, Text, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, Text, Table, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.models import Base
@@ -6,27 +6,35 @@ from app.models import Base
 m2m_group_account = Table(
     "m2m_group_account",
     Base.metadata,
-    Column("group_id", ForeignKey("group.id"), primary_key=True),
-    Column("account_id", ForeignKey("account.id"), primary_key=True),
+    Column("group_id", ForeignKey("groups.id"), primary_key=True),
+    Column("account_id", ForeignKey("accounts.id"), primary_key=True),
+    Index("ix_m2m_group_account_account_id_group_id", "account_id", "group_id"),
 )
 
 m2m_group_vm = Table(
     "m2m_group_vm",
     Base.metadata,
-    Column("group_id", ForeignKey("group.id"), primary_key=True),
-    Column("vm_id", ForeignKey("vm.id"), primary_key=True),
+    Column("group_id", ForeignKey("groups.id"), primary_key=True),
+    Column("vm_id", ForeignKey("vms.id"), primary_key=True),
+    Index("ix_m2m_group_vm_vm_id_group_id", "vm_id", "group_id"),
 )
 
 
 class Group(Base):
     __tablename__ = 'groups'
+    __table_args__ = (
+        Index('ix_groups_deleted_id', 'deleted', 'id'),
+        Index('ix_groups_deleted_updated_at', 'deleted', 'updated_at'),
+        Index('ix_groups_deleted_version', 'deleted', 'version'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
     deleted = Column(Boolean, default=False)
+    version = Column(Integer, nullable=False, default=0, server_default='0')
 
-    name = Column(String(50), nullable=False)
+    name = Column(String(50), nullable=False, index=True)
     description = Column(Text, nullable=False, default='')
 
     accounts = relationship("Account", secondary=m2m_group_account, back_populates="groups")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 
 from app.models import Base
@@ -6,14 +6,20 @@ from app.models import Base
 
 class Server(Base):
     __tablename__ = 'servers'
+    __table_args__ = (
+        Index('ix_servers_deleted_id', 'deleted', 'id'),
+        Index('ix_servers_deleted_updated_at', 'deleted', 'updated_at'),
+        Index('ix_servers_deleted_version', 'deleted', 'version'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
     deleted = Column(Boolean, default=False)
+    version = Column(Integer, nullable=False, default=0, server_default='0')
 
-    ip_address = Column(String(15), nullable=False, default='')
-    name = Column(String(50), nullable=False, default='')
+    ip_address = Column(String(15), nullable=False, default='', index=True)
+    name = Column(String(50), nullable=False, default='', index=True)
     specs = Column(Text, nullable=False, default='')
     description = Column(Text, nullable=False, default='')
     username = Column(String(50), nullable=False, default='')
@@ -1,15 +1,19 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, Text, Index
 
 from app.models import Base
 
 
 class Version(Base):
     __tablename__ = 'versions'
+    __table_args__ = (
+        Index('ix_versions_deleted_version', 'deleted', 'version'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
     deleted = Column(Boolean, default=False)
+    version = Column(Integer, nullable=False, default=0, server_default='0')
 
     title = Column(String(255), nullable=False, default='')
     text = Column(Text, nullable=False, default='')
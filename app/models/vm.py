@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.models import Base
@@ -7,13 +7,20 @@ from app.models.group import m2m_group_vm
 
 class VM(Base):
     __tablename__ = 'vms'
+    __table_args__ = (
+        Index('ix_vms_server_id_state', 'server_id', 'state'),
+        Index('ix_vms_deleted_id', 'deleted', 'id'),
+        Index('ix_vms_deleted_updated_at', 'deleted', 'updated_at'),
+        Index('ix_vms_deleted_version', 'deleted', 'version'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
     deleted = Column(Boolean, default=False)
+    version = Column(Integer, nullable=False, default=0, server_default='0')
 
-    name = Column(String(50), nullable=False, default='')
+    name = Column(String(50), nullable=False, default='', index=True)
     cpu = Column(Integer, nullable=False, default=0)
     ram = Column(Integer, nullable=False, default=0)
     ssd = Column(Integer, nullable=False, default=0)
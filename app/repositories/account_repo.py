@@ -1,99 +1,117 @@
 from typing import Optional, Sequence, cast
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, exists, select, and_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.models import Account
 from app.models.group import m2m_group_account, Group
-from app.repositories.base_repo import BaseRepository
+from app.repositories.base_repo import BaseRepository, Loads
+from app.utils.account_cache import AccountSnapshot
 from app.utils.logger import logger
 
 
 class AccountRepository(BaseRepository[Account]):
+    filterable = ("department", "post")
+    sortable = ("id", "updated_at", "username", "surname")
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, Account)
 
     async def get_by_username(self, username: str) -> Optional[Account]:
         try:
-            stmt = (
+            stmt = self._statement("by_username", lambda: (
                 select(Account)
-                .where(Account.username == username)
-            )
-            result = await self.db.scalars(stmt)
+                .options(*self._loader_options())
+                .where(Account.username == bindparam("username"))
+            ))
+            result = await self.db.scalars(stmt, {"username": username})
             return result.one_or_none()
         except SQLAlchemyError as e:
             logger.error(f"Error fetching accounts by username: {e}")
             await self.db.rollback()
             return None
 
-    async def get_all_accounts_by_group(self, group_id: int) -> list[Account]:
+    async def get_snapshot_by_username(self, username: str) -> Optional[AccountSnapshot]:
         try:
-            stmt = (
+            stmt = self._statement("snapshot_by_username", lambda: (
+                select(Account.id, Account.deleted, Group.id)
+                .outerjoin(m2m_group_account, m2m_group_account.c.account_id == Account.id)
+                .outerjoin(Group, and_(Group.id == m2m_group_account.c.group_id, Group.deleted.is_(False)))
+                .where(Account.username == bindparam("username"))
+            ))
+            rows = (await self.db.execute(stmt, {"username": username})).all()
+            if not rows:
+                return None
+            account_id, deleted, _ = rows[0]
+            group_ids = tuple(sorted(group_id for _, _, group_id in rows if group_id is not None))
+            return AccountSnapshot(id=account_id, username=username, deleted=bool(deleted), group_ids=group_ids)
+        except SQLAlchemyError as e:
+            logger.error(f"Error fetching account snapshot by username: {e}")
+            await self.db.rollback()
+            return None
+
+    async def get_all_accounts_by_group(self, group_id: int, load: Optional[Loads] = None) -> list[Account]:
+        try:
+            stmt = self._statement(self._load_key("by_group", load), lambda: (
                 select(Account)
-                .options(selectinload(Account.groups))
+                .options(*self._loader_options(load))
                 .join(m2m_group_account)
-                .where(cast("ColumnElement[bool]", m2m_group_account.c.group_id == group_id))
-            )
-            result = await self.db.scalars(stmt)
-            return list(result.all())
+                .where(cast("ColumnElement[bool]", m2m_group_account.c.group_id == bindparam("group_id")))
+            ))
+            result = await self.db.scalars(stmt, {"group_id": group_id})
+            return list(result.unique().all())
         except SQLAlchemyError as e:
             logger.error(f"Error fetching accounts by group: {e}")
             await self.db.rollback()
             return []
 
+    async def get_by_id_in_groups(
+        self, item_id: int, group_ids: Sequence[int], fields: Sequence[str] = (), load: Optional[Loads] = None
+    ) -> Optional[Account]:
+        in_groups = exists().where(
+            m2m_group_account.c.account_id == Account.id,
+            m2m_group_account.c.group_id.in_(bindparam("group_ids", expanding=True)),
+        )
+        if fields:
+            return await self.get_by_id(item_id, in_groups.params(group_ids=list(group_ids)), fields=fields)
+
+        stmt = self._statement(self._load_key("by_id_in_groups", load), lambda: self._select(load=load).where(
+            Account.id == bindparam("item_id"),
+            Account.deleted.is_(False),
+            in_groups,
+        ))
+        return await self._first(stmt, {"item_id": item_id, "group_ids": list(group_ids)})
+
     async def get_all_groups_by_account(self, account_id: int) -> list[Group]:
         try:
-            stmt = (
+            stmt = self._statement("groups_by_account", lambda: (
                 select(Account)
-                .options(selectinload(Account.groups))
+                .options(*self._loader_options({"groups": "selectin"}))
                 .where(
-                    Account.id == account_id,
+                    Account.id == bindparam("account_id"),
                     Account.deleted.is_(False)
                 )
-            )
-            account = await self.db.scalar(stmt)
+            ))
+            account = await self.db.scalar(stmt, {"account_id": account_id})
             return account.groups if account else []
         except SQLAlchemyError as e:
             logger.error(f"Error fetching groups by account: {e}")
             await self.db.rollback()
             return []
 
-    async def add_group_to_account(self, account_id: int, group_id: int) -> Optional[Account]:
-        try:
-            account = await self.get_by_id(account_id)
-            group = await self.db.scalar(
-                select(Group).where(Group.id == group_id)
-            )
+    async def add_groups_to_account(self, account_id: int, group_ids: Sequence[int]) -> Optional[int]:
+        return await self._add_links(m2m_group_account, "account_id", Group, "group_id", account_id, group_ids)
 
-            if not account or not group or group in account.groups:
-                return None
+    async def remove_groups_from_account(self, account_id: int, group_ids: Sequence[int]) -> Optional[int]:
+        return await self._remove_links(m2m_group_account, "account_id", "group_id", account_id, group_ids)
 
-            account.groups.append(group)
-            await self.db.commit()
-            await self.db.refresh(account)
-            return account
-        except SQLAlchemyError as e:
-            logger.error(f"Error adding group to account: {e}")
-            await self.db.rollback()
+    async def add_group_to_account(self, account_id: int, group_id: int) -> Optional[Account]:
+        if not await self.add_groups_to_account(account_id, [group_id]):
             return None
+        return await self.get_by_id(account_id)
 
     async def remove_group_from_account(self, account_id: int, group_id: int) -> Optional[Account]:
-        try:
-            account = await self.get_by_id(account_id)
-            group = await self.db.scalar(
-                select(Group).where(Group.id == group_id)
-            )
-
-            if not account or not group or group not in account.groups:
-                return None
-
-            account.groups.remove(group)
-            await self.db.commit()
-            await self.db.refresh(account)
-            return account
-        except SQLAlchemyError as e:
-            logger.error(f"Error removing group from account: {e}")
-            await self.db.rollback()
+        if not await self.remove_groups_from_account(account_id, [group_id]):
             return None
+        return await self.get_by_id(account_id)
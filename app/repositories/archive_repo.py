@@ -0,0 +1,156 @@
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import Table, select, insert, delete, and_, or_, exists, func, literal
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Base, archive_tables
+from app.models.group import m2m_group_account, m2m_group_vm
+from app.utils.logger import logger
+
+RETENTION_TABLES = ("vms", "accounts", "groups", "servers", "versions")
+
+LINKS = {
+    "accounts": ((m2m_group_account, "account_id", "group_id"),),
+    "groups": ((m2m_group_account, "group_id", "account_id"), (m2m_group_vm, "group_id", "vm_id")),
+    "vms": ((m2m_group_vm, "vm_id", "group_id"),),
+}
+
+# rows that still reference a parent keep it in the hot table
+BLOCKERS = {
+    "servers": (("vms", "server_id"),),
+}
+
+
+class ArchiveRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _expired(table: Table, cutoff: datetime):
+        return and_(
+            table.c.deleted.is_(True),
+            or_(
+                table.c.updated_at < cutoff,
+                and_(table.c.updated_at.is_(None), table.c.created_at < cutoff),
+            ),
+            *(
+                ~exists().where(Base.metadata.tables[child].c[key] == table.c.id)
+                for child, key in BLOCKERS.get(table.name, ())
+            ),
+        )
+
+    async def count_expired(self, table_name: str, cutoff: datetime) -> int:
+        table = Base.metadata.tables[table_name]
+        try:
+            return await self.db.scalar(select(func.count()).select_from(table).where(self._expired(table, cutoff)))
+        except SQLAlchemyError as e:
+            logger.error(f"Error counting expired {table_name}: {e}")
+            await self.db.rollback()
+            return 0
+
+    async def expired_ids(self, table_name: str, cutoff: datetime, limit: int) -> list[int]:
+        table = Base.metadata.tables[table_name]
+        stmt = select(table.c.id).where(self._expired(table, cutoff)).order_by(table.c.id).limit(limit)
+        try:
+            return list((await self.db.scalars(stmt)).all())
+        except SQLAlchemyError as e:
+            logger.error(f"Error fetching expired {table_name}: {e}")
+            await self.db.rollback()
+            return []
+
+    async def _move(self, source: Table, target: Table, condition, archived_at: datetime) -> None:
+        await self.db.execute(
+            insert(target).from_select(
+                [*source.c.keys(), "archived_at"],
+                select(*source.c, literal(archived_at, target.c.archived_at.type)).where(condition),
+            )
+        )
+
+    async def archive_batch(self, table_name: str, ids: Sequence[int], archive: bool = True) -> Optional[int]:
+        table = Base.metadata.tables[table_name]
+        archived_at = datetime.now()
+        try:
+            for link, own_key, _ in LINKS.get(table_name, ()):
+                condition = link.c[own_key].in_(ids)
+                if archive:
+                    await self._move(link, archive_tables[link.name], condition, archived_at)
+                await self.db.execute(delete(link).where(condition))
+
+            if archive:
+                await self._move(table, archive_tables[table_name], table.c.id.in_(ids), archived_at)
+            result = await self.db.execute(delete(table).where(table.c.id.in_(ids)))
+            await self.db.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Error archiving {table_name}: {e}")
+            await self.db.rollback()
+            return None
+
+    async def _restore_conflicts(self, table: Table, archive: Table, ids: Sequence[int]) -> dict[int, str]:
+        # archived ids and unique values can be taken by new rows in the meantime
+        live_ids = (await self.db.scalars(select(table.c.id).where(table.c.id.in_(ids)))).all()
+        conflicts = {item_id: "id is already in use" for item_id in live_ids}
+        for column in (column for column in table.c if column.unique):
+            rows = (await self.db.execute(
+                select(archive.c.id, archive.c[column.name]).where(archive.c.id.in_(ids))
+            )).tuples().all()
+            taken = set((await self.db.scalars(select(column).where(column.in_({value for _, value in rows})))).all())
+            for item_id, value in rows:
+                if item_id in conflicts or value is None:
+                    continue
+                if value in taken:
+                    conflicts[item_id] = f"{column.name} {value!r} is already in use"
+                taken.add(value)
+        return conflicts
+
+    async def restore(self, table_name: str, ids: Sequence[int]) -> Optional[tuple[list[int], dict[int, str]]]:
+        table = Base.metadata.tables[table_name]
+        archive = archive_tables[table_name]
+        parents = [
+            exists().where(foreign_key.column == archive.c[column.name])
+            for column in table.c
+            for foreign_key in column.foreign_keys
+        ]
+        try:
+            conflicts = await self._restore_conflicts(table, archive, ids)
+            restorable = [
+                item_id for item_id in (await self.db.scalars(
+                    select(archive.c.id).where(archive.c.id.in_(ids), *parents)
+                )).all()
+                if item_id not in conflicts
+            ]
+            if not restorable:
+                return [], conflicts
+
+            columns = [
+                literal(False, table.c.deleted.type) if key == "deleted"
+                else func.now() if key == "updated_at"
+                else archive.c.version + 1 if key == "version"
+                else archive.c[key]
+                for key in table.c.keys()
+            ]
+            await self.db.execute(
+                insert(table).from_select(table.c.keys(), select(*columns).where(archive.c.id.in_(restorable)))
+            )
+            await self.db.execute(delete(archive).where(archive.c.id.in_(restorable)))
+
+            for link, own_key, other_key in LINKS.get(table_name, ()):
+                archived_link = archive_tables[link.name]
+                other = next(iter(link.c[other_key].foreign_keys)).column
+                condition = and_(
+                    archived_link.c[own_key].in_(restorable),
+                    exists().where(other == archived_link.c[other_key]),
+                )
+                await self.db.execute(
+                    insert(link).from_select(link.c.keys(), select(*(archived_link.c[key] for key in link.c.keys())).where(condition))
+                )
+                await self.db.execute(delete(archived_link).where(condition))
+
+            await self.db.commit()
+            return restorable, conflicts
+        except SQLAlchemyError as e:
+            logger.error(f"Error restoring {table_name}: {e}")
+            await self.db.rollback()
+            return None
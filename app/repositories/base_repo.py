@@ -1,80 +1,379 @@
-from typing import Type, TypeVar, Generic, Optional, Sequence
+from typing import Callable, Mapping, Type, TypeVar, Generic, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Executable, Table, bindparam, select, and_, or_, insert, update, delete, func, distinct, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, lazyload, noload, raiseload, selectinload
 
 from app.models import Base
 from app.repositories.abstract_repo import AbstractRepository
 from app.utils.logger import logger
+from app.utils.pagination import InvalidQuery, PageParams, decode_cursor, encode_cursor, parse_value
 
 T = TypeVar("T", bound=Base)
 
+# hot statements are built once per model and reused with bound parameters
+_statements: dict[tuple[type, str], Executable] = {}
+
+# relationship loaders a call site can ask for by name, e.g. load={"groups": "selectin"}
+LOADERS = {
+    "select": lazyload,
+    "selectin": selectinload,
+    "joined": joinedload,
+    "noload": noload,
+    "raise": raiseload,
+}
+
+Loads = Mapping[str, str]
+
+# per database url: whether a multi-row INSERT is guaranteed one consecutive auto-increment block
+_consecutive_ids: dict[str, bool] = {}
+
 
 class BaseRepository(AbstractRepository[T], Generic[T]):
+    filterable: tuple[str, ...] = ()
+    sortable: tuple[str, ...] = ("id", "updated_at")
+    default_loader: str = "raise"
+
     def __init__(self, db: AsyncSession, model: Type[T]):
         self.db = db
         self.model = model
 
-    async def get_all(self, *filters) -> list[T]:
+    def _statement(self, name: str, build: Callable[[], Executable]) -> Executable:
+        key = (self.model, name)
+        stmt = _statements.get(key)
+        if stmt is None:
+            stmt = _statements[key] = build()
+        return stmt
+
+    def _loader_options(self, load: Optional[Loads] = None, model: Optional[type] = None) -> list:
+        model = model or self.model
+        options = []
+        for name, strategy in (load or {}).items():
+            if strategy not in LOADERS:
+                raise ValueError(f"Unknown loader strategy for {model.__name__}.{name}: {strategy}")
+            options.append(LOADERS[strategy](getattr(model, name)))
+        options.append(LOADERS[self.default_loader]("*"))
+        return options
+
+    @staticmethod
+    def _load_key(name: str, load: Optional[Loads] = None) -> str:
+        if not load:
+            return name
+        return name + ":" + ",".join(f"{key}={value}" for key, value in sorted(load.items()))
+
+    async def get_all(self, *filters, load: Optional[Loads] = None) -> list[T]:
         base_filters = [self.model.deleted.is_(False)]
         if filters:
             base_filters.extend(filters)
-        stmt = select(self.model).where(*base_filters).distinct()
+        stmt = self._select(load=load).where(*base_filters).distinct()
         result = await self.db.scalars(stmt)
-        return list(result.all())
+        return list(result.unique().all())
+
+    def _keyset_condition(self, column, descending: bool, value, last_id: int):
+        after_id = self.model.id < last_id if descending else self.model.id > last_id
+        if column is self.model.id:
+            return after_id
+        if value is None:
+            tie = and_(column.is_(None), after_id)
+            return tie if descending else or_(tie, column.is_not(None))
+        after_value = column < value if descending else column > value
+        condition = or_(after_value, and_(column == value, after_id))
+        return or_(condition, column.is_(None)) if descending else condition
+
+    def _filter_clauses(self, page: PageParams) -> list:
+        clauses = []
+        for field, raw_values in page.filters:
+            if field not in self.filterable:
+                raise InvalidQuery(f"Cannot filter {self.model.__name__} by {field}")
+            column = getattr(self.model, field)
+            values = [parse_value(raw, column.type.python_type) for raw in raw_values]
+            clauses.append(column == values[0] if len(values) == 1 else column.in_(values))
+        return clauses
+
+    def _select(self, fields: Sequence[str] = (), load: Optional[Loads] = None):
+        if not fields:
+            return select(self.model).options(*self._loader_options(load))
+        unknown = [field for field in fields if field not in self.model.__table__.c]
+        if unknown:
+            raise InvalidQuery(f"Unknown {self.model.__name__} fields: {', '.join(unknown)}")
+        return select(*(getattr(self.model, field) for field in fields))
+
+    async def _fetch(self, stmt, fields: Sequence[str] = ()) -> list:
+        if fields:
+            return list((await self.db.execute(stmt)).mappings().all())
+        return list((await self.db.scalars(stmt)).unique().all())
+
+    async def _first(self, stmt, params: Optional[dict] = None) -> Optional[T]:
+        return (await self.db.scalars(stmt, params)).unique().first()
+
+    async def get_page(self, page: PageParams, *filters, load: Optional[Loads] = None) -> tuple[list, Optional[str]]:
+        descending = page.sort.startswith("-")
+        field = page.sort.lstrip("-")
+        if field not in self.sortable:
+            raise InvalidQuery(f"Cannot sort {self.model.__name__} by {field}")
+
+        column = getattr(self.model, field)
+        base_filters = [self.model.deleted.is_(False)]
+        if filters:
+            base_filters.extend(filters)
+        base_filters.extend(self._filter_clauses(page))
+        if page.cursor:
+            value, last_id = decode_cursor(page.cursor, column.type.python_type)
+            base_filters.append(self._keyset_condition(column, descending, value, last_id))
+
+        order_by = [column.desc(), self.model.id.desc()] if descending else [column.asc(), self.model.id.asc()]
+        if column is self.model.id:
+            order_by = order_by[:1]
+        fields = tuple(dict.fromkeys((*page.fields, "id", field))) if page.fields else ()
+        stmt = self._select(fields, load).where(*base_filters).distinct().order_by(*order_by).limit(page.limit + 1)
+        records = await self._fetch(stmt, fields)
+
+        next_cursor = None
+        if len(records) > page.limit:
+            records = records[:page.limit]
+            last = records[-1]
+            if fields:
+                next_cursor = encode_cursor(last[field], last["id"])
+            else:
+                next_cursor = encode_cursor(getattr(last, field), last.id)
+        return records, next_cursor
+
+    async def get_by_id(
+        self, item_id: int, *filters, fields: Sequence[str] = (), load: Optional[Loads] = None
+    ) -> Optional[T]:
+        if not filters and not fields:
+            stmt = self._statement(self._load_key("by_id", load), lambda: self._select(load=load).where(
+                self.model.id == bindparam("item_id"),
+                self.model.deleted.is_(False),
+            ))
+            return await self._first(stmt, {"item_id": item_id})
 
-    async def get_by_id(self, item_id: int, *filters) -> Optional[T]:
         base_filters = [self.model.id == item_id, self.model.deleted.is_(False)]
         if filters:
             base_filters.extend(filters)
-        stmt = select(self.model).where(*base_filters)
-        return await self.db.scalar(stmt)
+        stmt = self._select(fields, load).where(*base_filters)
+        if fields:
+            return (await self.db.execute(stmt.limit(1))).mappings().first()
+        return await self._first(stmt)
+
+    async def get_version(self, *filters, page: Optional[PageParams] = None, item_id: Optional[int] = None) -> tuple:
+        base_filters = [self.model.deleted.is_(False)]
+        if item_id is not None:
+            base_filters.append(self.model.id == item_id)
+        if filters:
+            base_filters.extend(filters)
+        if page:
+            base_filters.extend(self._filter_clauses(page))
+        # every UPDATE bumps the row's version, so the sum moves even when timestamps tie
+        stmt = select(
+            func.count(distinct(self.model.id)),
+            func.max(self.model.id),
+            func.sum(self.model.version),
+        ).where(*base_filters)
+        return tuple((await self.db.execute(stmt)).one())
+
+    def _from_row(self, row) -> T:
+        return self.model(**{column.key: row[column.key] for column in self.model.__table__.c})
 
     async def create(self, item_data: dict) -> Optional[T]:
         logger.warning(f"BASE_REPO: Creating {self.model.__name__} with data {item_data}")
-        item = self.model(**item_data)
+        table = self.model.__table__
+        stmt = insert(self.model).values(item_data)
         try:
-            await self.db.merge(item)
+            if self.db.bind.dialect.insert_returning:
+                row = (await self.db.execute(stmt.returning(*table.c))).mappings().one()
+            else:
+                # no RETURNING on MySQL: created_at is a database default, so the row is read back
+                result = await self.db.execute(stmt)
+                row = (await self.db.execute(
+                    select(*table.c).where(self.model.id == result.inserted_primary_key[0])
+                )).mappings().one()
             await self.db.commit()
-            await self.db.refresh(item)
         except SQLAlchemyError as e:
             logger.error(f"Error creating item: {e}")
             await self.db.rollback()
             return None
-        return item
+        return self._from_row(row)
+
+    async def _update_one(self, item_id: int, values: dict) -> Optional[T]:
+        table = self.model.__table__
+        stmt = (
+            update(self.model)
+            .where(self.model.id == item_id, self.model.deleted.is_(False))
+            .values({"updated_at": func.now(), "version": self.model.version + 1, **values})
+            .execution_options(synchronize_session=False)
+        )
+        if self.db.bind.dialect.update_returning:
+            row = (await self.db.execute(stmt.returning(*table.c))).mappings().first()
+        else:
+            # no RETURNING on MySQL: the response needs columns the UPDATE did not set, so it is read back
+            result = await self.db.execute(stmt)
+            row = None
+            if result.rowcount:
+                row = (await self.db.execute(select(*table.c).where(self.model.id == item_id))).mappings().first()
+        await self.db.commit()
+        return self._from_row(row) if row else None
 
     async def update(self, item_id: int, item_data: dict) -> Optional[T]:
         logger.warning(f"BASE_REPO: Updating {self.model.__name__} with data {item_data}")
-        item = await self.get_by_id(item_id)
-        if not item:
+        try:
+            return await self._update_one(item_id, item_data)
+        except SQLAlchemyError as e:
+            logger.error(f"Error updating item: {e}")
+            await self.db.rollback()
             return None
 
-        for key, value in item_data.items():
-            setattr(item, key, value)
+    async def delete(self, item_id: int) -> Optional[T]:
+        try:
+            return await self._update_one(item_id, {"deleted": True})
+        except SQLAlchemyError as e:
+            logger.error(f"Error deleting item: {e}")
+            await self.db.rollback()
+            return None
 
+    async def _has_consecutive_ids(self) -> bool:
+        # ids of a multi-row INSERT are lastrowid + n only on MySQL with innodb_autoinc_lock_mode <= 1
+        # and auto_increment_increment = 1; MySQL 8 defaults to lock mode 2
+        if self.db.bind.dialect.name != "mysql":
+            return False
+        key = str(self.db.bind.url)
+        if key not in _consecutive_ids:
+            lock_mode, increment = (await self.db.execute(
+                text("SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment")
+            )).one()
+            _consecutive_ids[key] = int(lock_mode) <= 1 and int(increment) == 1
+            if not _consecutive_ids[key]:
+                logger.warning(
+                    f"BASE_REPO: innodb_autoinc_lock_mode={lock_mode}, auto_increment_increment={increment}; "
+                    f"bulk creates insert one row per statement to report exact ids"
+                )
+        return _consecutive_ids[key]
+
+    async def bulk_create(self, items: list[dict]) -> Optional[list[int]]:
+        logger.warning(f"BASE_REPO: Bulk creating {len(items)} {self.model.__name__} rows")
         try:
+            if self.db.bind.dialect.insert_returning:
+                stmt = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+                ids = list((await self.db.scalars(stmt, items)).all())
+            elif await self._has_consecutive_ids():
+                result = await self.db.execute(insert(self.model).values(items))
+                ids = list(range(result.lastrowid, result.lastrowid + len(items)))
+            else:
+                # interleaved ids (lock mode 2, the MySQL 8 default) cannot be mapped back to items,
+                # so exact per-item ids cost one INSERT per row inside the same transaction
+                ids = [(await self.db.execute(insert(self.model).values(item))).lastrowid for item in items]
             await self.db.commit()
-            await self.db.refresh(item)
+            return ids
         except SQLAlchemyError as e:
-            logger.error(f"Error updating item: {e}")
+            logger.error(f"Error bulk creating items: {e}")
             await self.db.rollback()
             return None
 
-        return item
+    def _upsert(self, items: list[dict]):
+        columns = [key for key in items[0] if key != "id"]
+        # conflict updates skip Column.onupdate, so updated_at and version are set explicitly
+        bump = {"updated_at": func.now(), "version": self.model.version + 1}
+        if self.db.bind.dialect.name == "sqlite":
+            stmt = sqlite_insert(self.model).values(items)
+            return stmt.on_conflict_do_update(
+                index_elements=[self.model.id],
+                set_={**{key: stmt.excluded[key] for key in columns}, **bump},
+            )
+        stmt = mysql_insert(self.model).values(items)
+        return stmt.on_duplicate_key_update({**{key: stmt.inserted[key] for key in columns}, **bump})
 
-    async def delete(self, item_id: int) -> Optional[T]:
-        item = await self.get_by_id(item_id)
-        if not item:
+    async def unique_conflicts(self, items: list[dict]) -> Optional[dict[int, str]]:
+        # ON DUPLICATE KEY UPDATE fires on any unique key, so an item whose unique value
+        # belongs to another row would overwrite that row instead of its own id
+        conflicts: dict[int, str] = {}
+        try:
+            for column in (column for column in self.model.__table__.c if column.unique):
+                values = {item[column.key] for item in items if item.get(column.key) is not None}
+                if not values:
+                    continue
+                stmt = select(column, self.model.id).where(column.in_(values))
+                owners = dict((await self.db.execute(stmt)).tuples().all())
+                for index, item in enumerate(items):
+                    value = item.get(column.key)
+                    if value is None or index in conflicts:
+                        continue
+                    owner = owners.setdefault(value, item["id"])
+                    if owner != item["id"]:
+                        conflicts[index] = f"{column.key} {value!r} belongs to id {owner}"
+            return conflicts
+        except SQLAlchemyError as e:
+            logger.error(f"Error checking unique keys: {e}")
+            await self.db.rollback()
             return None
 
-        item.deleted = True
+    async def bulk_upsert(self, items: list[dict]) -> Optional[list[int]]:
+        logger.warning(f"BASE_REPO: Bulk upserting {len(items)} {self.model.__name__} rows")
+        try:
+            await self.db.execute(self._upsert(items))
+            await self.db.commit()
+            return [item["id"] for item in items]
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk upserting items: {e}")
+            await self.db.rollback()
+            return None
+
+    async def _existing_ids(self, ids: Sequence[int]) -> set[int]:
+        stmt = select(self.model.id).where(self.model.id.in_(ids), self.model.deleted.is_(False))
+        return set((await self.db.scalars(stmt)).all())
+
+    async def bulk_update(self, ids: Sequence[int], item_data: dict) -> Optional[set[int]]:
+        logger.warning(f"BASE_REPO: Bulk updating {len(ids)} {self.model.__name__} rows with data {item_data}")
+        try:
+            found = await self._existing_ids(ids)
+            if found:
+                stmt = (
+                    update(self.model)
+                    .where(self.model.id.in_(found), self.model.deleted.is_(False))
+                    .values({"updated_at": func.now(), "version": self.model.version + 1, **item_data})
+                    .execution_options(synchronize_session=False)
+                )
+                await self.db.execute(stmt)
+                await self.db.commit()
+            return found
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk updating items: {e}")
+            await self.db.rollback()
+            return None
+
+    async def bulk_delete(self, ids: Sequence[int]) -> Optional[set[int]]:
+        return await self.bulk_update(ids, {"deleted": True})
 
+    async def _add_links(self, table: Table, own_key: str, other_model, other_key: str, item_id: int, other_ids: Sequence[int]) -> Optional[int]:
+        source = (
+            select(self.model.id, other_model.id)
+            .join(other_model, and_(other_model.id.in_(other_ids), other_model.deleted.is_(False)))
+            .where(self.model.id == item_id, self.model.deleted.is_(False))
+        )
+        stmt = (
+            insert(table)
+            .from_select([own_key, other_key], source)
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite")
+        )
         try:
+            result = await self.db.execute(stmt)
             await self.db.commit()
-            await self.db.refresh(item)
-            return item
+            return result.rowcount
         except SQLAlchemyError as e:
-            logger.error(f"Error deleting item: {e}")
+            logger.error(f"Error adding {table.name} links: {e}")
+            await self.db.rollback()
+            return None
+
+    async def _remove_links(self, table: Table, own_key: str, other_key: str, item_id: int, other_ids: Sequence[int]) -> Optional[int]:
+        stmt = delete(table).where(table.c[own_key] == item_id, table.c[other_key].in_(other_ids))
+        try:
+            result = await self.db.execute(stmt)
+            await self.db.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Error removing {table.name} links: {e}")
             await self.db.rollback()
             return None
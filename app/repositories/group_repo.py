@@ -1,31 +1,33 @@
 from typing import Optional, Sequence, cast
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.models import Account, VM
 from app.models.group import m2m_group_account, Group, m2m_group_vm
-from app.repositories.base_repo import BaseRepository
+from app.repositories.base_repo import BaseRepository, Loads
 from app.utils.logger import logger
 
 
 class GroupRepository(BaseRepository[Group]):
+    filterable = ("name",)
+    sortable = ("id", "updated_at", "name")
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, Group)
 
     async def get_all_groups_by_account(self, account_id: int) -> list[Group]:
         try:
-            stmt = (
+            stmt = self._statement("groups_by_account", lambda: (
                 select(Account)
-                .options(selectinload(Account.groups))
+                .options(*self._loader_options({"groups": "selectin"}, Account))
                 .where(
-                    Account.id == account_id,
+                    Account.id == bindparam("account_id"),
                     Account.deleted.is_(False)
                 )
-            )
-            account = await self.db.scalar(stmt)
+            ))
+            account = await self.db.scalar(stmt, {"account_id": account_id})
             return account.groups if account else []
         except SQLAlchemyError as e:
             logger.error(f"Error fetching groups by account: {e}")
@@ -34,123 +36,79 @@ class GroupRepository(BaseRepository[Group]):
 
     async def get_all_groups_by_vm(self, vm_id: int) -> list[Group]:
         try:
-            stmt = (
+            stmt = self._statement("groups_by_vm", lambda: (
                 select(VM)
-                .options(selectinload(VM.groups))
+                .options(*self._loader_options({"groups": "selectin"}, VM))
                 .where(
-                    VM.id == vm_id,
-                    Account.deleted.is_(False)
+                    VM.id == bindparam("vm_id"),
+                    VM.deleted.is_(False)
                 )
-            )
-            vm = await self.db.scalar(stmt)
+            ))
+            vm = await self.db.scalar(stmt, {"vm_id": vm_id})
             return vm.groups if vm else []
         except SQLAlchemyError as e:
             logger.error(f"Error fetching groups by vm: {e}")
             await self.db.rollback()
             return []
 
-    async def get_all_accounts_by_group(self, group_id: int) -> list[Account]:
+    async def get_all_accounts_by_group(self, group_id: int, load: Optional[Loads] = None) -> list[Account]:
         try:
-            stmt = (
+            stmt = self._statement(self._load_key("accounts_by_group", load), lambda: (
                 select(Account)
-                .options(selectinload(Account.groups))
+                .options(*self._loader_options(load, Account))
                 .join(m2m_group_account)
-                .where(cast("ColumnElement[bool]", m2m_group_account.c.group_id == group_id))
-            )
-            result = await self.db.scalars(stmt)
-            return list(result.all())
+                .where(cast("ColumnElement[bool]", m2m_group_account.c.group_id == bindparam("group_id")))
+            ))
+            result = await self.db.scalars(stmt, {"group_id": group_id})
+            return list(result.unique().all())
         except SQLAlchemyError as e:
             logger.error(f"Error fetching accounts by group: {e}")
             await self.db.rollback()
             return []
 
-    async def get_all_vms_by_group(self, group_id: int) -> list[VM]:
+    async def get_all_vms_by_group(self, group_id: int, load: Optional[Loads] = None) -> list[VM]:
         try:
-            stmt = (
+            stmt = self._statement(self._load_key("vms_by_group", load), lambda: (
                 select(VM)
-                .options(selectinload(VM.groups))
+                .options(*self._loader_options(load, VM))
                 .join(m2m_group_vm)
-                .where(cast("ColumnElement[bool]", m2m_group_vm.c.group_id == group_id))
-            )
-            result = await self.db.scalars(stmt)
-            return list(result.all())
+                .where(cast("ColumnElement[bool]", m2m_group_vm.c.group_id == bindparam("group_id")))
+            ))
+            result = await self.db.scalars(stmt, {"group_id": group_id})
+            return list(result.unique().all())
         except SQLAlchemyError as e:
             logger.error(f"Error fetching vms by group: {e}")
             await self.db.rollback()
             return []
 
+    async def add_accounts_to_group(self, group_id: int, account_ids: Sequence[int]) -> Optional[int]:
+        return await self._add_links(m2m_group_account, "group_id", Account, "account_id", group_id, account_ids)
+
+    async def add_vms_to_group(self, group_id: int, vm_ids: Sequence[int]) -> Optional[int]:
+        return await self._add_links(m2m_group_vm, "group_id", VM, "vm_id", group_id, vm_ids)
+
+    async def remove_accounts_from_group(self, group_id: int, account_ids: Sequence[int]) -> Optional[int]:
+        return await self._remove_links(m2m_group_account, "group_id", "account_id", group_id, account_ids)
+
+    async def remove_vms_from_group(self, group_id: int, vm_ids: Sequence[int]) -> Optional[int]:
+        return await self._remove_links(m2m_group_vm, "group_id", "vm_id", group_id, vm_ids)
+
     async def add_account_to_group(self, group_id: int, account_id: int) -> Optional[Group]:
-        try:
-            group = await self.get_by_id(group_id)
-            account = await self.db.scalar(
-                select(Account).where(Account.id == account_id)
-            )
-
-            if not group or not account or account in group.accounts:
-                return None
-
-            group.accounts.append(account)
-            await self.db.commit()
-            await self.db.refresh(group)
-            return group
-        except SQLAlchemyError as e:
-            logger.error(f"Error adding account to group: {e}")
-            await self.db.rollback()
+        if not await self.add_accounts_to_group(group_id, [account_id]):
             return None
+        return await self.get_by_id(group_id)
 
     async def add_vm_to_group(self, group_id: int, vm_id: int) -> Optional[Group]:
-        try:
-            group = await self.get_by_id(group_id)
-            vm = await self.db.scalar(
-                select(VM).where(VM.id == vm_id)
-            )
-
-            if not group or not vm or vm in group.vms:
-                return None
-
-            group.vms.append(vm)
-            await self.db.commit()
-            await self.db.refresh(group)
-            return group
-        except SQLAlchemyError as e:
-            logger.error(f"Error adding vm to group: {e}")
-            await self.db.rollback()
+        if not await self.add_vms_to_group(group_id, [vm_id]):
             return None
+        return await self.get_by_id(group_id)
 
     async def remove_account_from_group(self, group_id: int, account_id: int) -> Optional[Group]:
-        try:
-            group = await self.get_by_id(group_id)
-            account = await self.db.scalar(
-                select(Account).where(Account.id == account_id)
-            )
-
-            if not group or not account or account not in group.accounts:
-                return None
-
-            group.accounts.remove(account)
-            await self.db.commit()
-            await self.db.refresh(group)
-            return group
-        except SQLAlchemyError as e:
-            logger.error(f"Error removing account from group: {e}")
-            await self.db.rollback()
+        if not await self.remove_accounts_from_group(group_id, [account_id]):
             return None
+        return await self.get_by_id(group_id)
 
     async def remove_vm_from_group(self, group_id: int, vm_id: int) -> Optional[Group]:
-        try:
-            group = await self.get_by_id(group_id)
-            vm = await self.db.scalar(
-                select(VM).where(VM.id == vm_id)
-            )
-
-            if not group or not vm or vm not in group.vms:
-                return None
-
-            group.vms.remove(vm)
-            await self.db.commit()
-            await self.db.refresh(group)
-            return group
-        except SQLAlchemyError as e:
-            logger.error(f"Error removing vm from group: {e}")
-            await self.db.rollback()
+        if not await self.remove_vms_from_group(group_id, [vm_id]):
             return None
+        return await self.get_by_id(group_id)
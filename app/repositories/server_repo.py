@@ -5,5 +5,8 @@ from app.repositories.base_repo import BaseRepository
 
 
 class ServerRepository(BaseRepository[Server]):
+    filterable = ("name", "ip_address")
+    sortable = ("id", "updated_at", "name")
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, Server)
@@ -1,30 +1,93 @@
-from typing import Optional, cast
+from typing import Optional, Sequence, cast
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, exists, select, func, case, and_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.models import Account, VM
+from app.models import VM
 from app.models.group import Group, m2m_group_vm
-from app.repositories.base_repo import BaseRepository
+from app.repositories.base_repo import BaseRepository, Loads
 from app.utils.logger import logger
 
 
 class VMRepository(BaseRepository[VM]):
+    filterable = ("server_id", "state", "name")
+    sortable = ("id", "updated_at", "name", "cpu", "ram")
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, VM)
 
-    async def get_all_vms_by_group(self, group_id: int) -> list[VM]:
+    @staticmethod
+    def _capacity_columns() -> tuple:
+        return (
+            func.count(VM.id).label("vms"),
+            func.coalesce(func.sum(case((VM.state.is_(True), 1), else_=0)), 0).label("running"),
+            func.coalesce(func.sum(case((VM.state.is_(True), 0), else_=1)), 0).label("stopped"),
+            func.coalesce(func.sum(VM.cpu), 0).label("cpu"),
+            func.coalesce(func.sum(VM.ram), 0).label("ram"),
+            func.coalesce(func.sum(VM.ssd), 0).label("ssd"),
+            func.coalesce(func.sum(VM.hdd), 0).label("hdd"),
+        )
+
+    async def _fetch_capacity(self, stmt) -> list[dict]:
+        try:
+            return [dict(row) for row in (await self.db.execute(stmt)).mappings().all()]
+        except SQLAlchemyError as e:
+            logger.error(f"Error fetching vm capacity: {e}")
+            await self.db.rollback()
+            return []
+
+    async def get_capacity(self, *filters) -> list[dict]:
+        stmt = select(*self._capacity_columns()).where(VM.deleted.is_(False), *filters)
+        return await self._fetch_capacity(stmt)
+
+    async def get_capacity_by_server(self, *filters) -> list[dict]:
+        stmt = (
+            select(VM.server_id.label("id"), *self._capacity_columns())
+            .where(VM.deleted.is_(False), *filters)
+            .group_by(VM.server_id)
+            .order_by(VM.server_id)
+        )
+        return await self._fetch_capacity(stmt)
+
+    async def get_capacity_by_group(self, *filters) -> list[dict]:
+        stmt = (
+            select(m2m_group_vm.c.group_id.label("id"), *self._capacity_columns())
+            .join(m2m_group_vm, m2m_group_vm.c.vm_id == VM.id)
+            .join(Group, and_(Group.id == m2m_group_vm.c.group_id, Group.deleted.is_(False)))
+            .where(VM.deleted.is_(False), *filters)
+            .group_by(m2m_group_vm.c.group_id)
+            .order_by(m2m_group_vm.c.group_id)
+        )
+        return await self._fetch_capacity(stmt)
+
+    async def get_by_id_in_groups(
+        self, item_id: int, group_ids: Sequence[int], fields: Sequence[str] = (), load: Optional[Loads] = None
+    ) -> Optional[VM]:
+        in_groups = exists().where(
+            m2m_group_vm.c.vm_id == VM.id,
+            m2m_group_vm.c.group_id.in_(bindparam("group_ids", expanding=True)),
+        )
+        if fields:
+            return await self.get_by_id(item_id, in_groups.params(group_ids=list(group_ids)), fields=fields)
+
+        stmt = self._statement(self._load_key("by_id_in_groups", load), lambda: self._select(load=load).where(
+            VM.id == bindparam("item_id"),
+            VM.deleted.is_(False),
+            in_groups,
+        ))
+        return await self._first(stmt, {"item_id": item_id, "group_ids": list(group_ids)})
+
+    async def get_all_vms_by_group(self, group_id: int, load: Optional[Loads] = None) -> list[VM]:
         try:
-            stmt = (
+            stmt = self._statement(self._load_key("vms_by_group", load), lambda: (
                 select(VM)
-                .options(selectinload(VM.groups))
+                .options(*self._loader_options(load))
                 .join(m2m_group_vm)
-                .where(cast("ColumnElement[bool]", m2m_group_vm.c.group_id == group_id))
-            )
-            result = await self.db.scalars(stmt)
-            return list(result.all())
+                .where(cast("ColumnElement[bool]", m2m_group_vm.c.group_id == bindparam("group_id")))
+            ))
+            result = await self.db.scalars(stmt, {"group_id": group_id})
+            return list(result.unique().all())
         except SQLAlchemyError as e:
             logger.error(f"Error fetching vms by group: {e}")
             await self.db.rollback()
@@ -32,55 +95,33 @@ class VMRepository(BaseRepository[VM]):
 
     async def get_all_groups_by_vm(self, vm_id: int) -> list[Group]:
         try:
-            stmt = (
+            stmt = self._statement("groups_by_vm", lambda: (
                 select(VM)
-                .options(selectinload(VM.groups))
+                .options(*self._loader_options({"groups": "selectin"}))
                 .where(
-                    VM.id == vm_id,
-                    Account.deleted.is_(False)
+                    VM.id == bindparam("vm_id"),
+                    VM.deleted.is_(False)
                 )
-            )
-            vm = await self.db.scalar(stmt)
+            ))
+            vm = await self.db.scalar(stmt, {"vm_id": vm_id})
             return vm.groups if vm else []
         except SQLAlchemyError as e:
             logger.error(f"Error fetching groups by vm: {e}")
             await self.db.rollback()
             return []
 
+    async def add_groups_to_vm(self, vm_id: int, group_ids: Sequence[int]) -> Optional[int]:
+        return await self._add_links(m2m_group_vm, "vm_id", Group, "group_id", vm_id, group_ids)
+
+    async def remove_groups_from_vm(self, vm_id: int, group_ids: Sequence[int]) -> Optional[int]:
+        return await self._remove_links(m2m_group_vm, "vm_id", "group_id", vm_id, group_ids)
+
     async def add_group_to_vm(self, vm_id: int, group_id: int) -> Optional[VM]:
-        try:
-            vm = await self.get_by_id(vm_id)
-            group = await self.db.scalar(
-                select(Group).where(Group.id == group_id)
-            )
-
-            if not vm or not group or group in vm.groups:
-                return None
-
-            vm.groups.append(group)
-            await self.db.commit()
-            await self.db.refresh(vm)
-            return vm
-        except SQLAlchemyError as e:
-            logger.error(f"Error adding group to vm: {e}")
-            await self.db.rollback()
+        if not await self.add_groups_to_vm(vm_id, [group_id]):
             return None
+        return await self.get_by_id(vm_id)
 
     async def remove_group_from_vm(self, vm_id: int, group_id: int) -> Optional[VM]:
-        try:
-            vm = await self.get_by_id(vm_id)
-            group = await self.db.scalar(
-                select(Group).where(Group.id == group_id)
-            )
-
-            if not vm or not group or group not in vm.groups:
-                return None
-
-            vm.groups.remove(group)
-            await self.db.commit()
-            await self.db.refresh(vm)
-            return vm
-        except SQLAlchemyError as e:
-            logger.error(f"Error removing group from vm: {e}")
-            await self.db.rollback()
+        if not await self.remove_groups_from_vm(vm_id, [group_id]):
             return None
+        return await self.get_by_id(vm_id)
@@ -20,6 +20,10 @@ class AccountCreate(AccountBase):
     password: str
 
 
+class AccountUpsert(AccountCreate):
+    id: int
+
+
 class AccountUpdate(AccountBase):
     password: str = ''
 
@@ -29,5 +33,4 @@ class AccountOut(AccountBase):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,26 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    ok: bool = True
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    items: list[BulkItemResult]
+
+
+class BulkIds(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=1000)
+
+
+class BulkPatch(BulkIds):
+    data: dict[str, Any] = Field(min_length=1)
+
+
+class BulkCount(BaseModel):
+    count: int
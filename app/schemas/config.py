@@ -7,5 +7,4 @@ class ConfigBase(BaseModel):
 
 
 class ConfigOut(ConfigBase):
-    class Config:
-        model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True)
@@ -9,10 +9,13 @@ class GroupBase(BaseModel):
     description: str = ''
 
 
+class GroupUpsert(GroupBase):
+    id: int
+
+
 class GroupOut(GroupBase):
     id: int
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True)
@@ -13,5 +13,4 @@ class LogOut(LogBase):
     id: int
     created_at: Optional[datetime] = None
 
-    class Config:
-        model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True)
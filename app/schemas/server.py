@@ -13,10 +13,13 @@ class ServerBase(BaseModel):
     password: str = ''
 
 
+class ServerUpsert(ServerBase):
+    id: int
+
+
 class ServerOut(ServerBase):
     id: int
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True)
@@ -1,6 +1,22 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, Field
 
 
 class Token(BaseModel):
     access_token: str
-    token_type: str
\ No newline at end of file
+    token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class TokenBatch(BaseModel):
+    tokens: list[str] = Field(max_length=1000)
+
+
+class TokenCheckResult(BaseModel):
+    payload: Optional[dict] = None
+    error: Optional[str] = None
@@ -17,10 +17,28 @@ class VMBase(BaseModel):
     password: str = ''
 
 
+class VMCreate(VMBase):
+    server_id: int
+
+
+class VMUpsert(VMCreate):
+    id: int
+
+
 class VMOut(VMBase):
     id: int
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True)
+
+
+class VMCapacity(BaseModel):
+    id: Optional[int] = None
+    vms: int = 0
+    running: int = 0
+    stopped: int = 0
+    cpu: int = 0
+    ram: int = 0
+    ssd: int = 0
+    hdd: int = 0
@@ -1,15 +1,23 @@
-from typing import Optional
+import asyncio
+import time
+from typing import Optional, Sequence
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.settings import settings
 from app.models import Account
 from app.models.group import m2m_group_account
 from app.repositories.account_repo import AccountRepository
-from app.schemas.account import AccountCreate, AccountOut, AccountUpdate
+from app.schemas.account import AccountCreate, AccountOut, AccountUpdate, AccountUpsert
+from app.schemas.bulk import BulkResult
 from app.schemas.group import GroupOut
+from app.schemas.page import Page
 from app.services.auth_service import AuthService
 from app.services.base_service import BaseService
+from app.utils.account_cache import AccountSnapshot, account_cache
 from app.utils.logger import logger
+from app.utils.pagination import PageParams
 
 
 class AccountService(BaseService[AccountRepository]):
@@ -21,26 +29,78 @@ class AccountService(BaseService[AccountRepository]):
         logger.warning("ACCOUNT_SERVICE: Attempt to create account")
 
         item_data_dict = item_data.model_dump(exclude={"password"})
-        item_data_dict["hashed_password"] = self.auth_service.hash_password(item_data.password)
+        item_data_dict["hashed_password"] = await self.auth_service.hash_password(item_data.password)
 
         return await super().create(item_data_dict)
 
     async def update(self, item_id: int, item_data: AccountUpdate) -> Optional[AccountOut]:
         logger.warning("ACCOUNT_SERVICE: Attempt to update account")
-        item = await self.repository.get_by_id(item_id)
-        if not item:
+        updated_item = item_data.model_dump(exclude_unset=True)
+        password = updated_item.pop("password", "")
+        if password:
+            updated_item["hashed_password"] = await self.auth_service.hash_password(password)
+
+        account = await super().update(item_id, updated_item)
+        if not account:
             logger.warning(f"Attempt to update non-existent account: {item_id}")
-            return None
+        account_cache.invalidate_id(item_id)
+        return account
 
-        updated_item = item_data.model_dump(exclude_unset=True)
-        if "password" in updated_item and updated_item["password"]:
-            updated_item["hashed_password"] = self.auth_service.hash_password(updated_item["password"])
-            del updated_item["password"]
+    async def delete(self, item_id: int) -> Optional[AccountOut]:
+        account = await super().delete(item_id)
+        account_cache.invalidate_id(item_id)
+        return account
+
+    async def _with_hashed_passwords(self, items: Sequence[AccountCreate]) -> list[dict]:
+        hashed_passwords = []
+        for start in range(0, len(items), settings.PASSWORD_HASH_WORKERS):
+            chunk = items[start:start + settings.PASSWORD_HASH_WORKERS]
+            hashed_passwords += await asyncio.gather(*(self.auth_service.hash_password(item.password) for item in chunk))
+
+        data = []
+        for item, hashed_password in zip(items, hashed_passwords):
+            item_data_dict = item.model_dump(exclude={"password"})
+            item_data_dict["hashed_password"] = hashed_password
+            data.append(item_data_dict)
+        return data
+
+    async def bulk_create(self, items: Sequence[AccountCreate]) -> BulkResult:
+        logger.warning(f"ACCOUNT_SERVICE: Attempt to bulk create {len(items)} accounts")
+        return await super().bulk_create(await self._with_hashed_passwords(items))
 
-        return await super().update(item_id, updated_item)
+    async def bulk_upsert(self, items: Sequence[AccountUpsert]) -> BulkResult:
+        logger.warning(f"ACCOUNT_SERVICE: Attempt to bulk upsert {len(items)} accounts")
+        result = await super().bulk_upsert(await self._with_hashed_passwords(items))
+        for item in items:
+            account_cache.invalidate_id(item.id)
+        return result
 
-    async def get_all_accounts_by_account(self, current_account: AccountOut) -> list[AccountOut]:
-        group_ids = [group.id for group in current_account.groups]
+    async def bulk_update(self, ids: Sequence[int], data: dict) -> BulkResult:
+        result = await super().bulk_update(ids, data)
+        for item_id in ids:
+            account_cache.invalidate_id(item_id)
+        return result
+
+    async def bulk_delete(self, ids: Sequence[int]) -> BulkResult:
+        result = await super().bulk_delete(ids)
+        for item_id in ids:
+            account_cache.invalidate_id(item_id)
+        return result
+
+    async def get_by_username(self, username: str) -> Optional[AccountOut]:
+        account = await self.repository.get_by_username(username)
+        return AccountOut.model_validate(account) if account else None
+
+    async def get_snapshot_by_username(self, username: str) -> Optional[AccountSnapshot]:
+        snapshot = account_cache.get(username)
+        if snapshot is None:
+            snapshot = await self.repository.get_snapshot_by_username(username)
+            if snapshot:
+                account_cache.put(snapshot)
+        return snapshot
+
+    async def get_all_accounts_by_account(self, current_account: AccountSnapshot) -> list[AccountOut]:
+        group_ids = current_account.group_ids
         if not group_ids:
             return []
         filters = [
@@ -49,15 +109,99 @@ class AccountService(BaseService[AccountRepository]):
         ]
         return await super().get_all(*filters)
 
-    async def get_account_by_id_by_account(self, item_id: int, current_account: AccountOut) -> Optional[AccountOut]:
-        group_ids = [group.id for group in current_account.groups]
+    async def get_page_by_account(self, page: PageParams, current_account: AccountSnapshot) -> Page[AccountOut]:
+        group_ids = current_account.group_ids
         if not group_ids:
+            return Page(items=[])
+        filters = [
+            m2m_group_account.c.group_id.in_(group_ids),
+            m2m_group_account.c.account_id == Account.id,
+        ]
+        return await super().get_page(page, *filters)
+
+    async def get_account_by_id_by_account(self, item_id: int, current_account: AccountSnapshot, fields: Sequence[str] = ()) -> Optional[AccountOut]:
+        if not current_account.group_ids:
             return None
+        self._check_fields(fields)
+        record = await self.repository.get_by_id_in_groups(item_id, current_account.group_ids, fields=fields)
+        return self._to_out(record, fields) if record else None
+
+    async def get_version_by_account(self, current_account: AccountSnapshot, *filters, page: Optional[PageParams] = None, item_id: Optional[int] = None) -> tuple:
+        group_ids = current_account.group_ids
+        if not group_ids:
+            return 0, None, None
         filters = [
             m2m_group_account.c.group_id.in_(group_ids),
             m2m_group_account.c.account_id == Account.id,
+            *filters,
         ]
-        return await super().get_by_id(item_id, *filters)
+        return await super().get_version(*filters, page=page, item_id=item_id)
+
+    @staticmethod
+    def _in_groups(group_ids: Sequence[int]):
+        return Account.id.in_(select(m2m_group_account.c.account_id).where(m2m_group_account.c.group_id.in_(group_ids)))
+
+    @staticmethod
+    def role_group_id(role: str) -> int:
+        return {"owner": settings.OWNER_GROUP_ID, "admin": settings.ADMIN_GROUP_ID}.get(role, 0)
+
+    def _role_filters(self, role: str, current_account: Optional[AccountSnapshot]) -> Optional[list]:
+        group_id = self.role_group_id(role)
+        if not group_id or (current_account is not None and not current_account.group_ids):
+            return None
+        filters = [self._in_groups([group_id])]
+        if current_account is not None:
+            filters.append(self._in_groups(current_account.group_ids))
+        return filters
+
+    async def get_all_by_role(self, role: str, current_account: Optional[AccountSnapshot] = None) -> list[AccountOut]:
+        filters = self._role_filters(role, current_account)
+        return await super().get_all(*filters) if filters else []
+
+    async def get_by_id_by_role(self, item_id: int, role: str, current_account: Optional[AccountSnapshot] = None) -> Optional[AccountOut]:
+        filters = self._role_filters(role, current_account)
+        return await super().get_by_id(item_id, *filters) if filters else None
+
+    async def create_with_role(self, item_data: AccountCreate, role: str) -> Optional[AccountOut]:
+        group_id = self.role_group_id(role)
+        if not group_id:
+            return None
+        account = await self.create(item_data)
+        if account:
+            await self.add_groups_to_account(account.id, [group_id])
+        return account
+
+    def _managed_filters(self, current_account: AccountSnapshot) -> Optional[list]:
+        # admins manage plain users that share one of their groups
+        privileged = [group_id for group_id in (settings.OWNER_GROUP_ID, settings.ADMIN_GROUP_ID) if group_id]
+        if not current_account.group_ids:
+            return None
+        filters = [self._in_groups(current_account.group_ids)]
+        if privileged:
+            filters.append(~self._in_groups(privileged))
+        return filters
+
+    async def create_by_account(self, item_data: AccountCreate, current_account: AccountSnapshot) -> Optional[AccountOut]:
+        group_ids = [
+            group_id for group_id in current_account.group_ids
+            if group_id not in (settings.OWNER_GROUP_ID, settings.ADMIN_GROUP_ID)
+        ]
+        account = await self.create(item_data)
+        if account and group_ids:
+            await self.add_groups_to_account(account.id, group_ids)
+        return account
+
+    async def update_by_account(self, item_id: int, item_data: AccountUpdate, current_account: AccountSnapshot) -> Optional[AccountOut]:
+        filters = self._managed_filters(current_account)
+        if not filters or not await super().get_by_id(item_id, *filters):
+            return None
+        return await self.update(item_id, item_data)
+
+    async def delete_by_account(self, item_id: int, current_account: AccountSnapshot) -> Optional[AccountOut]:
+        filters = self._managed_filters(current_account)
+        if not filters or not await super().get_by_id(item_id, *filters):
+            return None
+        return await self.delete(item_id)
 
     async def get_all_accounts_by_group(self, current_group: GroupOut) -> list[AccountOut]:
         records = await self.repository.get_all_accounts_by_group(current_group.id)
@@ -70,27 +214,100 @@ class AccountService(BaseService[AccountRepository]):
         ]
         return await super().get_by_id(item_id, *filters)
 
-    async def get_all_groups_by_account(self, current_account: AccountOut) -> list[GroupOut]:
+    async def get_all_groups_by_account(self, current_account: AccountSnapshot) -> list[GroupOut]:
         records = await self.repository.get_all_groups_by_account(current_account.id)
         return [GroupOut.model_validate(record) for record in records]
 
     async def add_group_to_account(self, account_id: int, group_id: int) -> Optional[AccountOut]:
         account = await self.repository.add_group_to_account(account_id, group_id)
+        account_cache.invalidate_id(account_id)
         return AccountOut.model_validate(account) if account else None
 
     async def remove_group_from_account(self, account_id: int, group_id: int) -> Optional[AccountOut]:
         account = await self.repository.remove_group_from_account(account_id, group_id)
+        account_cache.invalidate_id(account_id)
         return AccountOut.model_validate(account) if account else None
 
+    async def add_groups_to_account(self, account_id: int, group_ids: Sequence[int]) -> Optional[int]:
+        added = await self.repository.add_groups_to_account(account_id, group_ids)
+        account_cache.invalidate_id(account_id)
+        return added
+
+    async def remove_groups_from_account(self, account_id: int, group_ids: Sequence[int]) -> Optional[int]:
+        removed = await self.repository.remove_groups_from_account(account_id, group_ids)
+        account_cache.invalidate_id(account_id)
+        return removed
+
     async def authenticate_account(self, username: str, password: str) -> Optional[AccountOut]:
         account = await self.repository.get_by_username(username)
-        if not account or not self.auth_service.verify_password(password, account.hashed_password):
+        if not account:
+            logger.warning(f"Failed to authenticate account: {username}")
+            return None
+
+        started = time.perf_counter()
+        verified = await self.auth_service.verify_password(password, account.hashed_password)
+        logger.info(f"ACCOUNT_SERVICE: Password check for {username} took {(time.perf_counter() - started) * 1000:.0f} ms")
+        if not verified:
             logger.warning(f"Failed to authenticate account: {username}")
             return None
-        return AccountOut.model_validate(account) if account else None
 
-    async def create_account_token(self, account: AccountOut) -> Optional[str]:
+        if self.auth_service.password_needs_rehash(account.hashed_password):
+            logger.info(f"ACCOUNT_SERVICE: Rehashing password for {username} with current bcrypt cost")
+            hashed_password = await self.auth_service.hash_password(password)
+            account = await self.repository.update(account.id, {"hashed_password": hashed_password}) or account
+        return AccountOut.model_validate(account)
+
+    @staticmethod
+    def role_for(snapshot: AccountSnapshot) -> str:
+        if settings.OWNER_GROUP_ID and settings.OWNER_GROUP_ID in snapshot.group_ids:
+            return "owner"
+        if settings.ADMIN_GROUP_ID and settings.ADMIN_GROUP_ID in snapshot.group_ids:
+            return "admin"
+        return "user"
+
+    async def get_role(self, account: AccountOut) -> Optional[str]:
+        snapshot = await self.get_snapshot_by_username(account.username)
+        return self.role_for(snapshot) if snapshot else None
+
+    def _snapshot_claims(self, snapshot: AccountSnapshot, role: Optional[str] = None) -> dict:
+        return {
+            "sub": snapshot.username,
+            "role": role or self.role_for(snapshot),
+            "aid": snapshot.id,
+            "gv": snapshot.group_version,
+        }
+
+    async def _account_claims(self, account: AccountOut, role: Optional[str]) -> Optional[dict]:
         if not account:
             return None
-        token_data: dict = AccountOut.model_dump(account)
+        snapshot = await self.get_snapshot_by_username(account.username)
+        if not snapshot:
+            return None
+        return self._snapshot_claims(snapshot, role)
+
+    async def create_account_token(self, account: AccountOut, role: Optional[str] = None) -> Optional[str]:
+        token_data = await self._account_claims(account, role)
+        if not token_data:
+            return None
         return await self.auth_service.create_access_token(token_data)
+
+    async def create_account_refresh_token(self, account: AccountOut, role: Optional[str] = None) -> Optional[str]:
+        token_data = await self._account_claims(account, role)
+        if not token_data:
+            return None
+        return await self.auth_service.create_refresh_token(token_data)
+
+    async def refresh_tokens(self, refresh_token: str) -> Optional[tuple[str, str]]:
+        payload = await self.auth_service.verify_token(refresh_token)
+        if not payload or payload.get("typ") != "refresh":
+            return None
+
+        snapshot = await self.get_snapshot_by_username(payload.get("sub"))
+        if not snapshot or snapshot.deleted or payload.get("aid") != snapshot.id:
+            logger.warning(f"ACCOUNT_SERVICE: Refresh for missing or deleted account: {payload.get('sub')}")
+            self.auth_service.revoke_payload(payload)
+            return None
+
+        self.auth_service.revoke_payload(payload)
+        claims = self._snapshot_claims(snapshot)
+        return await self.auth_service.create_access_token(claims), await self.auth_service.create_refresh_token(claims)
@@ -1,47 +1,126 @@
 from datetime import datetime, timedelta, timezone
+import uuid
+from typing import Optional
 import jwt
-from jwt import PyJWTError
-from passlib.context import CryptContext
+from jwt import InvalidTokenError, PyJWTError
+from app.core.hashing import password_hasher
+from app.core.keys import KeyRing, key_ring
 from app.core.settings import settings
+from app.utils.revocation import revocation_list
+from app.utils.token_cache import token_cache
 import asyncio
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
 class AuthService:
     def __init__(
         self,
-        secret_key: str = settings.SECRET_KEY,
-        algorithm: str = settings.ALGORITHM,
+        keys: KeyRing = key_ring,
         expire_minutes: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES,
+        refresh_expire_minutes: int = settings.REFRESH_TOKEN_EXPIRE_MINUTES,
     ):
-        self.secret_key = secret_key
-        self.algorithm = algorithm
+        self.keys = keys
         self.expire_minutes = expire_minutes
+        self.refresh_expire_minutes = refresh_expire_minutes
 
-    async def create_access_token(self, data: dict) -> str:
+    async def _create_token(self, data: dict, token_type: str, expire_minutes: int) -> str:
         to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + timedelta(minutes=self.expire_minutes)
-        to_encode.update({"exp": expire})
+        expire = datetime.now(timezone.utc) + timedelta(minutes=expire_minutes)
+        to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "typ": token_type})
         token = await asyncio.to_thread(
-            jwt.encode, to_encode, self.secret_key, algorithm=self.algorithm or "HS256"
+            jwt.encode, to_encode, self.keys.signing_key, algorithm=self.keys.algorithm, headers=self.keys.headers
         )
         return token
 
+    async def create_access_token(self, data: dict) -> str:
+        return await self._create_token(data, "access", self.expire_minutes)
+
+    async def create_refresh_token(self, data: dict) -> str:
+        return await self._create_token(data, "refresh", self.refresh_expire_minutes)
+
+    @staticmethod
+    def revoke_payload(payload: dict) -> None:
+        if payload.get("jti") and isinstance(payload.get("exp"), (int, float)):
+            revocation_list.revoke(payload["jti"], payload["exp"])
+
+    async def revoke_token(self, token: str) -> bool:
+        payload = await self.verify_token(token)
+        if not payload:
+            return False
+        self.revoke_payload(payload)
+        return True
+
+    def _decode(self, token: str) -> dict:
+        kid = jwt.get_unverified_header(token).get("kid") if self.keys.is_asymmetric else None
+        key = self.keys.verification_key(kid)
+        if key is None:
+            raise InvalidTokenError(f"Unknown signing key: {kid}")
+        return jwt.decode(token, key, algorithms=[self.keys.algorithm])
+
     async def verify_token(self, token: str):
-        try:
-            payload = await asyncio.to_thread(
-                jwt.decode, token, self.secret_key, algorithms=[self.algorithm]
-            )
-            return payload
-        except PyJWTError:
+        payload = token_cache.get(token)
+        if payload is None:
+            try:
+                payload = await asyncio.to_thread(self._decode, token)
+            except PyJWTError:
+                return None
+            token_cache.put(token, payload)
+
+        if revocation_list.is_revoked(payload.get("jti")):
+            return None
+        return payload
+
+    async def verify_access_token(self, token: str) -> Optional[dict]:
+        payload = await self.verify_token(token)
+        if not payload or payload.get("typ") != "access":
             return None
+        return payload
+
+    def _decode_many(self, tokens: list[str]) -> list[tuple[Optional[dict], Optional[str]]]:
+        results = []
+        for token in tokens:
+            try:
+                results.append((self._decode(token), None))
+            except PyJWTError as e:
+                results.append((None, str(e)))
+        return results
+
+    async def verify_tokens(self, tokens: list[str]) -> list[tuple[Optional[dict], Optional[str]]]:
+        results: list[tuple[Optional[dict], Optional[str]]] = [(None, None)] * len(tokens)
+        misses = []
+        for index, token in enumerate(tokens):
+            payload = token_cache.get(token)
+            if payload is None:
+                misses.append(index)
+            elif revocation_list.is_revoked(payload.get("jti")):
+                results[index] = (None, "Token has been revoked")
+            else:
+                results[index] = (payload, None)
+
+        if misses:
+            decoded = await asyncio.to_thread(self._decode_many, [tokens[index] for index in misses])
+            for index, (payload, error) in zip(misses, decoded):
+                if payload is not None:
+                    token_cache.put(tokens[index], payload)
+                    if revocation_list.is_revoked(payload.get("jti")):
+                        payload, error = None, "Token has been revoked"
+                results[index] = (payload, error)
+
+        return results
+
+    async def verify_access_tokens(self, tokens: list[str]) -> list[tuple[Optional[dict], Optional[str]]]:
+        return [
+            (None, "Not an access token") if payload and payload.get("typ") != "access" else (payload, error)
+            for payload, error in await self.verify_tokens(tokens)
+        ]
 
     @staticmethod
     async def hash_password(password: str) -> str:
-        return await asyncio.to_thread(pwd_context.hash, password)
+        return await password_hasher.hash(password)
 
     @staticmethod
     async def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
+        return await password_hasher.verify(plain_password, hashed_password)
+
+    @staticmethod
+    def password_needs_rehash(hashed_password: str) -> bool:
+        return password_hasher.needs_update(hashed_password)
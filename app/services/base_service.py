@@ -1,6 +1,9 @@
 from typing import Optional, Type, TypeVar, Generic, Sequence
 
 from app.repositories.base_repo import BaseRepository
+from app.schemas.bulk import BulkItemResult, BulkResult
+from app.schemas.page import Page
+from app.utils.pagination import InvalidQuery, PageParams
 
 T = TypeVar("T", bound=BaseRepository)
 SchemaOut = TypeVar("SchemaOut")
@@ -16,9 +19,28 @@ class BaseService(Generic[T]):
         records = await self.repository.get_all(*filters)
         return [self.schema_out.model_validate(record) for record in records]
 
-    async def get_by_id(self, record_id: int, *filters) -> Optional[SchemaOut]:
-        record = await self.repository.get_by_id(record_id, *filters)
-        return self.schema_out.model_validate(record) if record else None
+    def _check_fields(self, fields: Sequence[str]) -> None:
+        unknown = [field for field in fields if field not in self.schema_out.model_fields]
+        if unknown:
+            raise InvalidQuery(f"Unknown fields: {', '.join(unknown)}")
+
+    def _to_out(self, record, fields: Sequence[str] = ()):
+        if fields:
+            return {field: record[field] for field in fields}
+        return self.schema_out.model_validate(record)
+
+    async def get_page(self, page: PageParams, *filters) -> Page[SchemaOut]:
+        self._check_fields(page.fields)
+        records, next_cursor = await self.repository.get_page(page, *filters)
+        return Page(items=[self._to_out(record, page.fields) for record in records], next_cursor=next_cursor)
+
+    async def get_by_id(self, record_id: int, *filters, fields: Sequence[str] = ()) -> Optional[SchemaOut]:
+        self._check_fields(fields)
+        record = await self.repository.get_by_id(record_id, *filters, fields=fields)
+        return self._to_out(record, fields) if record else None
+
+    async def get_version(self, *filters, page: Optional[PageParams] = None, item_id: Optional[int] = None) -> tuple:
+        return await self.repository.get_version(*filters, page=page, item_id=item_id)
 
     async def create(self, data: SchemaBase) -> Optional[SchemaOut]:
         if not isinstance(data, dict):
@@ -41,3 +63,49 @@ class BaseService(Generic[T]):
         if record:
             return self.schema_out.model_validate(record)
         return None
+
+    @staticmethod
+    def _bulk_result(ids: Sequence[int], found: Optional[Sequence[int]]) -> BulkResult:
+        if found is None:
+            return BulkResult(items=[
+                BulkItemResult(index=index, id=item_id, ok=False, error="Database error")
+                for index, item_id in enumerate(ids)
+            ])
+        return BulkResult(items=[
+            BulkItemResult(index=index, id=item_id) if item_id in found
+            else BulkItemResult(index=index, id=item_id, ok=False, error="Not found")
+            for index, item_id in enumerate(ids)
+        ])
+
+    async def bulk_create(self, items: Sequence[SchemaBase]) -> BulkResult:
+        data = [item if isinstance(item, dict) else item.model_dump() for item in items]
+        ids = await self.repository.bulk_create(data)
+        if ids is None:
+            return BulkResult(items=[
+                BulkItemResult(index=index, ok=False, error="Database error") for index in range(len(data))
+            ])
+        return BulkResult(items=[BulkItemResult(index=index, id=item_id) for index, item_id in enumerate(ids)])
+
+    async def bulk_upsert(self, items: Sequence[SchemaBase]) -> BulkResult:
+        data = [item if isinstance(item, dict) else item.model_dump() for item in items]
+        ids = [item["id"] for item in data]
+        conflicts = await self.repository.unique_conflicts(data)
+        if conflicts is None:
+            return self._bulk_result(ids, None)
+
+        rows = [item for index, item in enumerate(data) if index not in conflicts]
+        upserted = await self.repository.bulk_upsert(rows) if rows else []
+        result = self._bulk_result(ids, upserted)
+        for index, error in conflicts.items():
+            result.items[index] = BulkItemResult(index=index, id=ids[index], ok=False, error=error)
+        return result
+
+    async def bulk_update(self, ids: Sequence[int], data: dict) -> BulkResult:
+        read_only = {"id", "created_at", "updated_at"}
+        unknown = [key for key in data if key in read_only or key not in self.schema_out.model_fields]
+        if unknown:
+            raise InvalidQuery(f"Cannot bulk update fields: {', '.join(unknown)}")
+        return self._bulk_result(ids, await self.repository.bulk_update(ids, data))
+
+    async def bulk_delete(self, ids: Sequence[int]) -> BulkResult:
+        return self._bulk_result(ids, await self.repository.bulk_delete(ids))
@@ -1,18 +1,48 @@
-from typing import Optional
+from typing import Optional, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models import Group
 from app.repositories.group_repo import GroupRepository
 from app.schemas.account import AccountOut
+from app.schemas.bulk import BulkResult
 from app.schemas.group import GroupOut
+from app.schemas.page import Page
 from app.schemas.vm import VMOut
 from app.services.base_service import BaseService
+from app.utils.account_cache import AccountSnapshot, account_cache
+from app.utils.pagination import PageParams
 
 
 class GroupService(BaseService[GroupRepository]):
     def __init__(self, db: AsyncSession):
         super().__init__(GroupRepository(db), GroupOut)
 
+    async def delete(self, record_id: int) -> Optional[GroupOut]:
+        group = await super().delete(record_id)
+        account_cache.clear()
+        return group
+
+    async def bulk_delete(self, ids: Sequence[int]) -> BulkResult:
+        result = await super().bulk_delete(ids)
+        account_cache.clear()
+        return result
+
+    async def get_page_by_account(self, page: PageParams, current_account: AccountSnapshot) -> Page[GroupOut]:
+        if not current_account.group_ids:
+            return Page(items=[])
+        return await super().get_page(page, Group.id.in_(current_account.group_ids))
+
+    async def get_group_by_id_by_account(self, item_id: int, current_account: AccountSnapshot, fields: Sequence[str] = ()) -> Optional[GroupOut]:
+        if item_id not in current_account.group_ids:
+            return None
+        return await super().get_by_id(item_id, fields=fields)
+
+    async def get_version_by_account(self, current_account: AccountSnapshot, *filters, page: Optional[PageParams] = None, item_id: Optional[int] = None) -> tuple:
+        if not current_account.group_ids:
+            return 0, None, None
+        return await super().get_version(Group.id.in_(current_account.group_ids), *filters, page=page, item_id=item_id)
+
     async def get_all_groups_by_account(self, current_account: AccountOut) -> list[GroupOut]:
         records = await self.repository.get_all_groups_by_account(current_account.id)
         return [GroupOut.model_validate(record) for record in records]
@@ -31,6 +61,7 @@ class GroupService(BaseService[GroupRepository]):
 
     async def add_account_to_group(self, group: GroupOut, account: AccountOut) -> Optional[GroupOut]:
         group = await self.repository.add_account_to_group(group.id, account.id)
+        account_cache.invalidate_id(account.id)
         return GroupOut.model_validate(group) if group else None
 
     async def add_vm_to_group(self, group: GroupOut, vm: VMOut) -> Optional[GroupOut]:
@@ -39,8 +70,27 @@ class GroupService(BaseService[GroupRepository]):
 
     async def remove_account_from_group(self, group: GroupOut, account: AccountOut) -> Optional[GroupOut]:
         group = await self.repository.remove_account_from_group(group.id, account.id)
+        account_cache.invalidate_id(account.id)
         return GroupOut.model_validate(group) if group else None
 
     async def remove_vm_from_group(self, group: GroupOut, vm: VMOut) -> Optional[GroupOut]:
         group = await self.repository.remove_vm_from_group(group.id, vm.id)
-        return GroupOut.model_validate(group) if group else None
\ No newline at end of file
+        return GroupOut.model_validate(group) if group else None
+
+    async def add_accounts_to_group(self, group_id: int, account_ids: Sequence[int]) -> Optional[int]:
+        added = await self.repository.add_accounts_to_group(group_id, account_ids)
+        for account_id in account_ids:
+            account_cache.invalidate_id(account_id)
+        return added
+
+    async def add_vms_to_group(self, group_id: int, vm_ids: Sequence[int]) -> Optional[int]:
+        return await self.repository.add_vms_to_group(group_id, vm_ids)
+
+    async def remove_accounts_from_group(self, group_id: int, account_ids: Sequence[int]) -> Optional[int]:
+        removed = await self.repository.remove_accounts_from_group(group_id, account_ids)
+        for account_id in account_ids:
+            account_cache.invalidate_id(account_id)
+        return removed
+
+    async def remove_vms_from_group(self, group_id: int, vm_ids: Sequence[int]) -> Optional[int]:
+        return await self.repository.remove_vms_from_group(group_id, vm_ids)
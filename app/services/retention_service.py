@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import settings
+from app.repositories.archive_repo import RETENTION_TABLES, ArchiveRepository
+from app.utils.account_cache import account_cache
+from app.utils.logger import logger
+from app.utils.pagination import InvalidQuery
+from app.utils.retention import retention_progress
+
+
+class RetentionService:
+    def __init__(self, db: AsyncSession):
+        self.repository = ArchiveRepository(db)
+
+    async def run(self, dry_run: bool = False) -> dict:
+        if retention_progress.running:
+            return retention_progress.stats()
+
+        cutoff = datetime.now() - timedelta(days=settings.RETENTION_DAYS)
+        # purging is irreversible, so it has to be asked for by name
+        archive = settings.RETENTION_MODE != "purge"
+        logger.warning(f"RETENTION_SERVICE: {settings.RETENTION_MODE} rows deleted before {cutoff}, dry_run={dry_run}")
+        retention_progress.start(dry_run)
+        try:
+            for table in RETENTION_TABLES:
+                if dry_run:
+                    retention_progress.record(table, eligible=await self.repository.count_expired(table, cutoff))
+                    continue
+
+                while ids := await self.repository.expired_ids(table, cutoff, settings.RETENTION_BATCH_SIZE):
+                    moved = await self.repository.archive_batch(table, ids, archive)
+                    if moved is None:
+                        break
+                    retention_progress.record(table, eligible=len(ids), moved=moved, batches=1)
+                    logger.info(f"RETENTION_SERVICE: Moved {moved} {table} rows")
+                    await asyncio.sleep(0)
+        finally:
+            retention_progress.finish()
+        return retention_progress.stats()
+
+    async def restore(self, table: str, ids: Sequence[int]) -> Optional[tuple[list[int], dict[int, str]]]:
+        if table not in RETENTION_TABLES:
+            raise InvalidQuery(f"Cannot restore {table}")
+
+        logger.warning(f"RETENTION_SERVICE: Restoring {len(ids)} {table} rows")
+        result = await self.repository.restore(table, ids)
+        if result is None:
+            return None
+
+        restored, conflicts = result
+        for item_id, error in conflicts.items():
+            logger.warning(f"RETENTION_SERVICE: Skipped restoring {table} {item_id}: {error}")
+        if table == "accounts":
+            for account_id in restored:
+                account_cache.invalidate_id(account_id)
+        elif table == "groups" and restored:
+            # restored groups bring their memberships back, so cached group_ids are stale
+            account_cache.clear()
+        return restored, conflicts
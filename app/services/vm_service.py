@@ -1,17 +1,66 @@
-from typing import Optional
+from typing import Optional, Sequence
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models import VM
+from app.models.group import m2m_group_vm
 from app.repositories.vm_repo import VMRepository
 from app.schemas.group import GroupOut
-from app.schemas.vm import VMOut
+from app.schemas.page import Page
+from app.schemas.vm import VMCapacity, VMOut
 from app.services.base_service import BaseService
+from app.utils.account_cache import AccountSnapshot
+from app.utils.pagination import PageParams
 
 
 class VMService(BaseService[VMRepository]):
     def __init__(self, db: AsyncSession):
         super().__init__(VMRepository(db), VMOut)
 
+    async def get_page_by_account(self, page: PageParams, current_account: AccountSnapshot) -> Page[VMOut]:
+        if not current_account.group_ids:
+            return Page(items=[])
+        filters = [
+            m2m_group_vm.c.group_id.in_(current_account.group_ids),
+            m2m_group_vm.c.vm_id == VM.id,
+        ]
+        return await super().get_page(page, *filters)
+
+    async def get_vm_by_id_by_account(self, item_id: int, current_account: AccountSnapshot, fields: Sequence[str] = ()) -> Optional[VMOut]:
+        if not current_account.group_ids:
+            return None
+        self._check_fields(fields)
+        record = await self.repository.get_by_id_in_groups(item_id, current_account.group_ids, fields=fields)
+        return self._to_out(record, fields) if record else None
+
+    async def get_version_by_account(self, current_account: AccountSnapshot, *filters, page: Optional[PageParams] = None, item_id: Optional[int] = None) -> tuple:
+        if not current_account.group_ids:
+            return 0, None, None
+        filters = [
+            m2m_group_vm.c.group_id.in_(current_account.group_ids),
+            m2m_group_vm.c.vm_id == VM.id,
+            *filters,
+        ]
+        return await super().get_version(*filters, page=page, item_id=item_id)
+
+    async def get_capacity(self, by: Optional[str] = None, *filters) -> list[VMCapacity]:
+        if by == "server":
+            rows = await self.repository.get_capacity_by_server(*filters)
+        elif by == "group":
+            rows = await self.repository.get_capacity_by_group(*filters)
+        else:
+            rows = await self.repository.get_capacity(*filters)
+        return [VMCapacity.model_validate(row) for row in rows]
+
+    async def get_capacity_by_account(self, current_account: AccountSnapshot, by: Optional[str] = None) -> list[VMCapacity]:
+        if not current_account.group_ids:
+            return []
+        if by == "group":
+            return await self.get_capacity(by, m2m_group_vm.c.group_id.in_(current_account.group_ids))
+        visible = select(m2m_group_vm.c.vm_id).where(m2m_group_vm.c.group_id.in_(current_account.group_ids))
+        return await self.get_capacity(by, VM.id.in_(visible))
+
     async def get_all_vms_by_group(self, current_group: GroupOut) -> list[VMOut]:
         records = await self.repository.get_all_vms_by_group(current_group.id)
         return [VMOut.model_validate(record) for record in records]
@@ -21,9 +70,15 @@ class VMService(BaseService[VMRepository]):
         return [GroupOut.model_validate(record) for record in records]
 
     async def add_group_to_vm(self, group: GroupOut, vm: VMOut) -> Optional[VMOut]:
-        vm = await self.repository.add_group_to_vm(group.id, vm.id)
+        vm = await self.repository.add_group_to_vm(vm.id, group.id)
         return VMOut.model_validate(vm) if vm else None
 
     async def remove_group_from_vm(self, group: GroupOut, vm: VMOut) -> Optional[VMOut]:
-        vm = await self.repository.remove_group_from_vm(group.id, vm.id)
+        vm = await self.repository.remove_group_from_vm(vm.id, group.id)
         return VMOut.model_validate(vm) if vm else None
+
+    async def add_groups_to_vm(self, vm_id: int, group_ids: Sequence[int]) -> Optional[int]:
+        return await self.repository.add_groups_to_vm(vm_id, group_ids)
+
+    async def remove_groups_from_vm(self, vm_id: int, group_ids: Sequence[int]) -> Optional[int]:
+        return await self.repository.remove_groups_from_vm(vm_id, group_ids)
@@ -0,0 +1,87 @@
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.settings import settings
+
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    id: int
+    username: str
+    deleted: bool
+    group_ids: tuple[int, ...]
+
+    @property
+    def group_version(self) -> int:
+        return zlib.crc32(",".join(map(str, self.group_ids)).encode())
+
+
+class AccountCache:
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: dict[str, tuple[float, AccountSnapshot]] = {}
+        self._usernames: dict[int, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, username: str) -> Optional[AccountSnapshot]:
+        entry = self._entries.get(username)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, snapshot = entry
+        if expires_at <= time.monotonic():
+            self._drop(username)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return snapshot
+
+    def put(self, snapshot: AccountSnapshot) -> None:
+        if self.ttl_seconds <= 0 or self.max_size <= 0:
+            return
+
+        if snapshot.username not in self._entries and len(self._entries) >= self.max_size:
+            self._drop(next(iter(self._entries)))
+
+        self._entries[snapshot.username] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._usernames[snapshot.id] = snapshot.username
+
+    def invalidate(self, username: str) -> None:
+        if username in self._entries:
+            self._drop(username)
+            self.invalidations += 1
+
+    def invalidate_id(self, account_id: int) -> None:
+        username = self._usernames.get(account_id)
+        if username is not None:
+            self.invalidate(username)
+
+    def clear(self) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._usernames.clear()
+
+    def _drop(self, username: str) -> None:
+        _, snapshot = self._entries.pop(username)
+        if self._usernames.get(snapshot.id) == username:
+            del self._usernames[snapshot.id]
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+account_cache = AccountCache(settings.ACCOUNT_CACHE_TTL_SECONDS, settings.ACCOUNT_CACHE_SIZE)
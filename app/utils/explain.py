@@ -0,0 +1,60 @@
+import re
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN",
+    "postgresql": "EXPLAIN",
+    "mysql": "EXPLAIN",
+    "mariadb": "EXPLAIN",
+}
+
+# any SCAN, with or without an index, walks the whole table; CONSTANT ROW is a FROM-less select
+SQLITE_FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(\w+)")
+# a boolean leading column narrows nothing: SEARCH on (deleted=?) alone still reads every live row
+SQLITE_DELETED_ONLY = re.compile(r"^SEARCH (\w+) USING (?:COVERING )?INDEX \w+ \(deleted=\?\)$")
+POSTGRES_FULL_SCAN = re.compile(r"Seq Scan on (\w+)")
+POSTGRES_INDEX_SCAN = re.compile(r"Index (?:Only )?Scan using \w+ on (\w+)")
+POSTGRES_DELETED_ONLY = re.compile(r"Index Cond: \(deleted = false\)$")
+MYSQL_BOOLEAN_KEY_LEN = 2
+
+
+async def explain(db: AsyncSession, stmt) -> list[dict]:
+    dialect = db.bind.dialect
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    connection = await db.connection()
+    result = await connection.exec_driver_sql(f"{EXPLAIN_PREFIX[dialect.name]} {compiled}", params)
+    return [dict(row) for row in result.mappings().all()]
+
+
+async def full_scans(db: AsyncSession, stmt) -> list[str]:
+    plan = await explain(db, stmt)
+    dialect_name = db.bind.dialect.name
+    tables = []
+    index_scan_table = None
+    for row in plan:
+        if dialect_name == "sqlite":
+            match = SQLITE_FULL_SCAN.match(row["detail"]) or SQLITE_DELETED_ONLY.match(row["detail"])
+            if match:
+                tables.append(match.group(1))
+        elif dialect_name == "postgresql":
+            line = row["QUERY PLAN"].strip()
+            match = POSTGRES_FULL_SCAN.search(line)
+            if match:
+                tables.append(match.group(1))
+            elif index_scan_table and POSTGRES_DELETED_ONLY.search(line):
+                tables.append(index_scan_table)
+            scan = POSTGRES_INDEX_SCAN.search(line)
+            index_scan_table = scan.group(1) if scan else None
+        elif row["type"] in ("ALL", "index"):
+            tables.append(row["table"])
+        elif (
+            row["type"] == "ref" and (row["key"] or "").startswith(f"ix_{row['table']}_deleted_")
+            and int(row["key_len"] or 0) <= MYSQL_BOOLEAN_KEY_LEN
+        ):
+            tables.append(row["table"])
+    return tables
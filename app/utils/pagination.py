@@ -0,0 +1,59 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+
+class InvalidQuery(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int = 50
+    cursor: Optional[str] = None
+    sort: str = "id"
+    filters: tuple[tuple[str, tuple[str, ...]], ...] = ()
+    fields: tuple[str, ...] = ()
+
+
+def parse_value(raw: str, python_type: type) -> Any:
+    if python_type is bool:
+        if raw.lower() in ("true", "1"):
+            return True
+        if raw.lower() in ("false", "0"):
+            return False
+        raise InvalidQuery(f"Invalid boolean: {raw}")
+    if python_type is int:
+        try:
+            return int(raw)
+        except ValueError as e:
+            raise InvalidQuery(f"Invalid integer: {raw}") from e
+    if python_type is datetime:
+        try:
+            return datetime.fromisoformat(raw)
+        except ValueError as e:
+            raise InvalidQuery(f"Invalid datetime: {raw}") from e
+    return raw
+
+
+def encode_cursor(value: Any, item_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, item_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, python_type: type) -> tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, item_id = json.loads(raw)
+        if value is not None and python_type is datetime:
+            value = datetime.fromisoformat(value)
+        if not isinstance(item_id, int):
+            raise ValueError(item_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise InvalidQuery(f"Invalid cursor: {cursor}") from e
+    return value, item_id
@@ -0,0 +1,132 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.logger import logger
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        self.statements[statement] += 1
+
+    @property
+    def total_ms(self) -> float:
+        return round(self.total_seconds * 1000, 2)
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        return {statement: count for statement, count in self.statements.items() if count >= threshold}
+
+
+class CompiledCacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def record(self, context) -> None:
+        if context is None:
+            return
+        if context.cache_hit is CACHE_HIT:
+            self.hits += 1
+        elif context.cache_hit is CACHE_MISS:
+            self.misses += 1
+        else:
+            self.uncached += 1
+
+    def stats(self) -> dict:
+        cached = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "hit_rate": round(self.hits / cached, 4) if cached else 0.0,
+        }
+
+
+compiled_cache_stats = CompiledCacheStats()
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, statement, _parameters, context, _executemany):
+    compiled_cache_stats.record(context)
+    stats = _current.get()
+    if stats is not None and conn.info.get("query_started"):
+        stats.record(statement, time.perf_counter() - conn.info["query_started"].pop())
+
+
+def install_query_stats() -> None:
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    with track_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        statements = "\n".join(f"{count}x {statement}" for statement, count in stats.statements.most_common())
+        raise AssertionError(f"Expected at most {max_queries} queries, got {stats.count}:\n{statements}")
+
+
+class QueryStatsMiddleware:
+    # plain ASGI: the app runs in the caller's task, so the tracking context var reaches it directly
+    def __init__(self, app: ASGIApp, repeated_threshold: int, expose_headers: bool = False):
+        self.app = app
+        self.repeated_threshold = repeated_threshold
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    self._report(scope, stats, message)
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+    def _report(self, scope: Scope, stats: QueryStats, message: Message) -> None:
+        repeated = stats.repeated(self.repeated_threshold)
+        for statement, count in repeated.items():
+            logger.warning(f"DB: Suspected N+1 in {scope['method']} {scope['path']}: {count}x {statement}")
+        if self.expose_headers:
+            headers = MutableHeaders(scope=message)
+            headers["X-DB-Queries"] = str(stats.count)
+            headers["X-DB-Time-Ms"] = str(stats.total_ms)
+            if repeated:
+                headers["X-DB-Repeated-Queries"] = str(sum(repeated.values()))
@@ -0,0 +1,43 @@
+import time
+from typing import Optional
+
+
+class RetentionProgress:
+    def __init__(self):
+        self.runs = 0
+        self.running = False
+        self.dry_run = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.tables: dict[str, dict[str, int]] = {}
+
+    def start(self, dry_run: bool) -> None:
+        self.runs += 1
+        self.running = True
+        self.dry_run = dry_run
+        self.started_at = time.time()
+        self.finished_at = None
+        self.tables = {}
+
+    def record(self, table: str, eligible: int = 0, moved: int = 0, batches: int = 0) -> None:
+        entry = self.tables.setdefault(table, {"eligible": 0, "moved": 0, "batches": 0})
+        entry["eligible"] += eligible
+        entry["moved"] += moved
+        entry["batches"] += batches
+
+    def finish(self) -> None:
+        self.running = False
+        self.finished_at = time.time()
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "running": self.running,
+            "dry_run": self.dry_run,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "tables": self.tables,
+        }
+
+
+retention_progress = RetentionProgress()
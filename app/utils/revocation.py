@@ -0,0 +1,35 @@
+import heapq
+import time
+from typing import Optional
+
+
+class RevocationList:
+    def __init__(self):
+        self._expires: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        if expires_at <= time.time() or jti in self._expires:
+            return
+        self._expires[jti] = expires_at
+        heapq.heappush(self._heap, (expires_at, jti))
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti or not self._expires:
+            return False
+        self.prune()
+        return jti in self._expires
+
+    def prune(self) -> None:
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, jti = heapq.heappop(self._heap)
+            self._expires.pop(jti, None)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._expires),
+        }
+
+
+revocation_list = RevocationList()
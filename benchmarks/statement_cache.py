@@ -0,0 +1,66 @@
+"""Per-call cost of building hot statements vs reusing prebuilt ones.
+
+    DATABASE_URL=sqlite+aiosqlite:// python -m benchmarks.statement_cache
+"""
+import asyncio
+import time
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Account, Base
+from app.repositories.account_repo import AccountRepository
+from app.utils.query_stats import compiled_cache_stats, install_query_stats
+
+CALLS = 5000
+
+
+def build_by_username(username: str):
+    return select(Account).where(Account.username == username)
+
+
+PREBUILT_BY_USERNAME = select(Account).where(Account.username == bindparam("username"))
+
+
+def timed(label: str, started: float, calls: int = CALLS) -> None:
+    print(f"{label:<32} {(time.perf_counter() - started) / calls * 1e6:8.1f} us/call")
+
+
+async def main() -> None:
+    install_query_stats()
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as db:
+        db.add(Account(username="bench", hashed_password="x", deleted=False))
+        await db.commit()
+
+        started = time.perf_counter()
+        for _ in range(CALLS):
+            build_by_username("bench")
+        timed("construct select()", started)
+
+        started = time.perf_counter()
+        for _ in range(CALLS):
+            await db.scalar(build_by_username("bench"))
+        timed("construct + execute", started)
+
+        started = time.perf_counter()
+        for _ in range(CALLS):
+            await db.scalar(PREBUILT_BY_USERNAME, {"username": "bench"})
+        timed("prebuilt + execute", started)
+
+        repository = AccountRepository(db)
+        started = time.perf_counter()
+        for _ in range(CALLS):
+            await repository.get_by_username("bench")
+        timed("AccountRepository.get_by_username", started)
+
+    print(f"compiled cache: {compiled_cache_stats.stats()}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
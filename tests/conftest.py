@@ -0,0 +1,44 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("PASSWORD_HASH_ROUNDS", "4")
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.db import make_engine
+from app.core.hashing import password_hasher
+from app.core.keys import KeyRing
+from app.core.settings import settings
+from app.models import Base, Account, Group, Server, VM
+from app.models.group import m2m_group_account, m2m_group_vm
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture(autouse=True, scope="session")
+def password_rounds():
+    # the app lifespan does this at startup; tests that hash passwords skip the lifespan
+    password_hasher.set_rounds(settings.PASSWORD_HASH_ROUNDS)
+
+
+@pytest.fixture
+async def db():
+    engine = make_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add(Server(id=1, name="s1"))
+        session.add_all([Group(id=1, name="g1"), Group(id=2, name="g2")])
+        session.add_all([Account(id=i, username=f"u{i}", hashed_password="x") for i in (1, 2, 3)])
+        session.add_all([VM(id=i, name=f"v{i}", server_id=1) for i in (1, 2, 3)])
+        await session.flush()
+        await session.execute(m2m_group_account.insert(), [{"group_id": 1, "account_id": 1}, {"group_id": 1, "account_id": 2}])
+        await session.execute(m2m_group_vm.insert(), [{"group_id": 1, "vm_id": 1}, {"group_id": 2, "vm_id": 2}])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def auth_service():
+    return AuthService(keys=KeyRing("HS256", "test-secret-key-that-is-long-enough"))
@@ -0,0 +1,22 @@
+from app.schemas.account import AccountUpdate
+from app.services.account_service import AccountService
+
+
+async def test_password_update_is_hashed_and_used_for_login(db, auth_service):
+    account_service = AccountService(db, auth_service)
+
+    updated = await account_service.update(1, AccountUpdate(username="u1", name="Ann", password="new-secret"))
+
+    assert updated is not None and updated.name == "Ann"
+    assert await account_service.authenticate_account("u1", "new-secret") is not None
+    assert await account_service.authenticate_account("u1", "wrong") is None
+
+
+async def test_empty_password_keeps_the_stored_hash(db, auth_service):
+    account_service = AccountService(db, auth_service)
+    await account_service.update(1, AccountUpdate(username="u1", password="first"))
+
+    updated = await account_service.update(1, AccountUpdate(username="u1", surname="Smith", password=""))
+
+    assert updated is not None and updated.surname == "Smith"
+    assert await account_service.authenticate_account("u1", "first") is not None
@@ -0,0 +1,30 @@
+from app.models import Account
+from app.schemas.account import AccountUpsert
+from app.services.account_service import AccountService
+
+
+async def test_unique_collision_is_reported_and_other_rows_are_written(db, auth_service):
+    result = await AccountService(db, auth_service).bulk_upsert([
+        AccountUpsert(id=1, username="u1-renamed", password="p"),
+        AccountUpsert(id=4, username="u2", password="p"),
+        AccountUpsert(id=5, username="u5", password="p"),
+    ])
+
+    assert [item.ok for item in result.items] == [True, False, True]
+    assert result.items[1].error == "username 'u2' belongs to id 2"
+
+    db.expire_all()
+    assert (await db.get(Account, 1)).username == "u1-renamed"
+    assert (await db.get(Account, 2)).username == "u2"
+    assert await db.get(Account, 4) is None
+    assert (await db.get(Account, 5)).username == "u5"
+
+
+async def test_collision_within_the_batch_keeps_the_first_row(db, auth_service):
+    result = await AccountService(db, auth_service).bulk_upsert([
+        AccountUpsert(id=6, username="dup", password="p"),
+        AccountUpsert(id=7, username="dup", password="p"),
+    ])
+
+    assert [item.ok for item in result.items] == [True, False]
+    assert result.items[1].error == "username 'dup' belongs to id 6"
@@ -0,0 +1,41 @@
+import httpx
+import pytest
+from sqlalchemy import update
+
+from app.core.db import get_db
+from app.dependencies.auth import Principal, get_current_principal
+from app.main import app
+from app.models import Account
+from app.schemas.account import AccountUpdate
+from app.services.account_service import AccountService
+from app.utils.account_cache import AccountSnapshot
+
+
+@pytest.fixture
+async def client(db):
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_principal] = lambda: Principal("owner", AccountSnapshot(1, "u1", False, ()))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+async def test_updates_within_one_second_change_the_etag(db, client, auth_service):
+    account_service = AccountService(db, auth_service)
+    first = await account_service.update(1, AccountUpdate(username="u1", name="first"))
+    stale = (await client.get("/accounts/1")).headers["ETag"]
+    stale_list = (await client.get("/accounts/")).headers["ETag"]
+
+    await account_service.update(1, AccountUpdate(username="u1", name="second"))
+    # pin the timestamp so both writes look like the same second
+    await db.execute(update(Account).where(Account.id == 1).values(updated_at=first.updated_at))
+    await db.commit()
+
+    response = await client.get("/accounts/1", headers={"If-None-Match": stale})
+    assert response.status_code == 200
+    assert response.json()["name"] == "second"
+    assert response.headers["ETag"] != stale
+
+    current = response.headers["ETag"]
+    assert (await client.get("/accounts/1", headers={"If-None-Match": current})).status_code == 304
+    assert (await client.get("/accounts/", headers={"If-None-Match": stale_list})).status_code == 200
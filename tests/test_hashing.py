@@ -0,0 +1,50 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from app.core.hashing import PasswordHasher, PasswordHasherBusy, _hash, pwd_context
+from app.core.settings import settings
+from app.main import password_hasher_busy_handler
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher("thread", workers=1, queue_size=1, retry_after=7)
+    yield hasher
+    hasher.shutdown()
+    hasher.set_rounds(settings.PASSWORD_HASH_ROUNDS)
+
+
+async def test_full_queue_is_rejected_with_retry_after(hasher):
+    release = threading.Event()
+    running = [asyncio.create_task(hasher._run(release.wait, 5)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(PasswordHasherBusy) as busy:
+        await hasher.hash("secret")
+    release.set()
+    await asyncio.gather(*running)
+
+    response = await password_hasher_busy_handler(None, busy.value)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+    assert "try again later" in json.loads(response.body)["detail"]
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.stats()["in_flight"] == 0
+
+
+async def test_calibrate_stays_within_bounds(hasher):
+    assert await hasher.calibrate(target_ms=0, min_rounds=4, max_rounds=6) == 4
+    assert await hasher.calibrate(target_ms=60_000, min_rounds=4, max_rounds=5) == 5
+    assert hasher.rounds == 5
+    assert pwd_context.handler("bcrypt").from_string(await hasher.hash("secret")).rounds == 5
+
+
+async def test_calibrated_floor_rehashes_weaker_but_keeps_stronger_hashes(hasher):
+    hasher.set_rounds(5)
+
+    assert hasher.needs_update(_hash("secret", 4))
+    assert not hasher.needs_update(_hash("secret", 5))
+    assert not hasher.needs_update(_hash("secret", 7))
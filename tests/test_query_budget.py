@@ -0,0 +1,38 @@
+import pytest
+
+from app.repositories.group_repo import GroupRepository
+from app.services.account_service import AccountService
+from app.services.auth_service import AuthService
+from app.services.group_service import GroupService
+from app.services.vm_service import VMService
+from app.utils.account_cache import AccountSnapshot
+from app.utils.pagination import PageParams
+from app.utils.query_stats import query_budget
+
+MEMBER = AccountSnapshot(id=1, username="u1", deleted=False, group_ids=(1, 2))
+
+# budget per call: the statements each endpoint needs, independent of how many rows come back
+BUDGETS = {
+    "account_snapshot": (1, lambda db: AccountService(db, AuthService()).get_snapshot_by_username("u1")),
+    "account_page_by_account": (1, lambda db: AccountService(db, AuthService()).get_page_by_account(PageParams(), MEMBER)),
+    "account_version_by_account": (1, lambda db: AccountService(db, AuthService()).get_version_by_account(MEMBER)),
+    "group_page_by_account": (1, lambda db: GroupService(db).get_page_by_account(PageParams(), MEMBER)),
+    "vm_page_by_account": (1, lambda db: VMService(db).get_page_by_account(PageParams(), MEMBER)),
+    "vm_by_id_by_account": (1, lambda db: VMService(db).get_vm_by_id_by_account(1, MEMBER)),
+    "vm_capacity_by_account": (1, lambda db: VMService(db).get_capacity_by_account(MEMBER, "server")),
+    "accounts_by_group_with_groups": (2, lambda db: GroupRepository(db).get_all_accounts_by_group(1, load={"groups": "selectin"})),
+}
+
+
+@pytest.mark.parametrize("name", BUDGETS)
+async def test_hot_calls_stay_within_budget(db, name):
+    budget, call = BUDGETS[name]
+    with query_budget(budget):
+        await call(db)
+
+
+async def test_query_budget_reports_overruns(db):
+    with pytest.raises(AssertionError, match="at most 1 queries, got 2"):
+        with query_budget(1):
+            await VMService(db).get_page_by_account(PageParams(), MEMBER)
+            await VMService(db).get_page_by_account(PageParams(), MEMBER)
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import event, insert, select, text
+
+from app.models import Account, Group, Server, VM
+from app.models.group import m2m_group_account, m2m_group_vm
+from app.repositories.account_repo import AccountRepository
+from app.repositories.group_repo import GroupRepository
+from app.repositories.vm_repo import VMRepository
+from app.utils.explain import explain, full_scans
+from app.utils.pagination import PageParams
+
+ROWS = 2000
+GROUPS = 100
+
+IN_GROUPS = (m2m_group_account.c.group_id.in_([1, 2]), m2m_group_account.c.account_id == Account.id)
+
+HOT_CALLS = {
+    "account_by_id": lambda db: AccountRepository(db).get_by_id(1),
+    "account_by_username": lambda db: AccountRepository(db).get_by_username("u1"),
+    "account_snapshot": lambda db: AccountRepository(db).get_snapshot_by_username("u1"),
+    "account_in_groups": lambda db: AccountRepository(db).get_by_id_in_groups(1, (1, 2)),
+    "account_page_in_groups": lambda db: AccountRepository(db).get_page(PageParams(), *IN_GROUPS),
+    "account_version_in_groups": lambda db: AccountRepository(db).get_version(*IN_GROUPS),
+    "groups_by_account": lambda db: GroupRepository(db).get_all_groups_by_account(1),
+    "accounts_by_group": lambda db: GroupRepository(db).get_all_accounts_by_group(1),
+    "vms_by_group": lambda db: GroupRepository(db).get_all_vms_by_group(1),
+    "vm_in_groups": lambda db: VMRepository(db).get_by_id_in_groups(1, (1, 2)),
+    "vm_page_by_server": lambda db: VMRepository(db).get_page(PageParams(filters=(("server_id", ("1",)),))),
+    "vm_capacity_by_server": lambda db: VMRepository(db).get_capacity_by_server(VM.id.in_([1, 2])),
+}
+
+# unscoped owner calls read live rows in index order by design: the first page stops after
+# `limit` rows and the list ETag aggregates every live row from a covering index
+LIVE_ROW_WALKS = {
+    "account_page": lambda db: AccountRepository(db).get_page(PageParams()),
+    "account_version": lambda db: AccountRepository(db).get_version(),
+    "vm_page": lambda db: VMRepository(db).get_page(PageParams()),
+}
+
+
+@pytest.fixture
+async def planned_db(db):
+    # enough rows, a few of them deleted, and fresh statistics so the planner picks real access paths
+    await db.execute(insert(Server), [{"id": i, "name": f"s{i}"} for i in range(2, 21)])
+    await db.execute(insert(Group), [{"id": i, "name": f"g{i}"} for i in range(3, GROUPS + 1)])
+    await db.execute(insert(Account), [
+        {"id": i, "username": f"u{i}", "hashed_password": "x", "deleted": i % 10 == 0} for i in range(4, ROWS + 1)
+    ])
+    await db.execute(insert(VM), [
+        {"id": i, "name": f"v{i}", "server_id": i % 20 + 1, "cpu": i % 8, "deleted": i % 10 == 0}
+        for i in range(4, ROWS + 1)
+    ])
+    await db.execute(insert(m2m_group_account), [{"group_id": i % GROUPS + 1, "account_id": i} for i in range(4, ROWS + 1)])
+    await db.execute(insert(m2m_group_vm), [{"group_id": i % GROUPS + 1, "vm_id": i} for i in range(4, ROWS + 1)])
+    await db.commit()
+    await db.execute(text("ANALYZE"))
+    return db
+
+
+async def captured(db, call) -> list:
+    statements = []
+
+    def record(_conn, clause, multiparams, params, _options):
+        statements.append((clause, params or (multiparams[0] if multiparams else {})))
+
+    event.listen(db.bind.sync_engine, "before_execute", record)
+    try:
+        await call(db)
+    finally:
+        event.remove(db.bind.sync_engine, "before_execute", record)
+
+    assert statements
+    return [clause.params(params) if params else clause for clause, params in statements]
+
+
+@pytest.mark.parametrize("name", HOT_CALLS)
+async def test_hot_queries_avoid_full_scans(planned_db, name):
+    for stmt in await captured(planned_db, HOT_CALLS[name]):
+        assert await full_scans(planned_db, stmt) == [], str(stmt)
+
+
+@pytest.mark.parametrize("name", LIVE_ROW_WALKS)
+async def test_live_row_walks_stay_on_an_index(planned_db, name):
+    for stmt in await captured(planned_db, LIVE_ROW_WALKS[name]):
+        details = [row["detail"] for row in await explain(planned_db, stmt)]
+        assert not any(detail.startswith("SCAN ") for detail in details), details
+        assert "USE TEMP B-TREE FOR ORDER BY" not in details, details
+
+
+async def test_deleted_only_search_counts_as_a_full_scan(planned_db):
+    assert await full_scans(planned_db, select(VM.id).where(VM.deleted.is_(False), VM.cpu == 1)) == ["vms"]
+    assert await full_scans(planned_db, select(VM.id).where(VM.cpu == 1)) == ["vms"]
@@ -0,0 +1,25 @@
+import pytest
+from pydantic import ValidationError
+
+from app.core.settings import Settings
+from app.repositories.archive_repo import ArchiveRepository
+from app.services.account_service import AccountService
+from app.services.group_service import GroupService
+from app.services.retention_service import RetentionService
+
+
+@pytest.mark.parametrize("mode", ["Purge", "archve", ""])
+def test_unknown_retention_mode_fails_at_startup(mode):
+    with pytest.raises(ValidationError):
+        Settings(RETENTION_MODE=mode)
+
+
+async def test_restoring_a_group_refreshes_cached_memberships(db, auth_service):
+    account_service = AccountService(db, auth_service)
+    await GroupService(db).delete(1)
+    assert await ArchiveRepository(db).archive_batch("groups", [1]) == 1
+    assert (await account_service.get_snapshot_by_username("u1")).group_ids == ()
+
+    assert await RetentionService(db).restore("groups", [1]) == ([1], {})
+
+    assert (await account_service.get_snapshot_by_username("u1")).group_ids == (1,)
@@ -0,0 +1,44 @@
+import time
+
+from app.services.account_service import AccountService
+from app.utils.revocation import RevocationList
+
+
+def test_revoked_ids_are_pruned_once_expired():
+    revocations = RevocationList()
+    revocations.revoke("live", time.time() + 60)
+    revocations.revoke("stale", time.time() - 1)
+    revocations.revoke("expiring", time.time() + 0.05)
+
+    assert revocations.is_revoked("live")
+    assert not revocations.is_revoked("stale")
+    assert revocations.is_revoked("expiring")
+
+    time.sleep(0.06)
+    assert not revocations.is_revoked("expiring")
+    assert revocations.stats()["size"] == 1
+
+
+async def test_revoked_token_is_rejected_even_when_cached(auth_service):
+    token = await auth_service.create_access_token({"sub": "u1"})
+    assert await auth_service.verify_access_token(token)
+
+    assert await auth_service.revoke_token(token)
+
+    assert await auth_service.verify_token(token) is None
+    assert not await auth_service.revoke_token(token)
+
+
+async def test_refresh_rotates_and_rejects_reuse(db, auth_service):
+    account_service = AccountService(db, auth_service)
+    account = await account_service.get_by_username("u1")
+    refresh_token = await account_service.create_account_refresh_token(account)
+
+    tokens = await account_service.refresh_tokens(refresh_token)
+
+    assert tokens is not None
+    access_token, rotated = tokens
+    assert (await auth_service.verify_access_token(access_token))["sub"] == "u1"
+    assert await account_service.refresh_tokens(refresh_token) is None
+    assert await account_service.refresh_tokens(access_token) is None
+    assert await account_service.refresh_tokens(rotated) is not None
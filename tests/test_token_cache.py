@@ -0,0 +1,41 @@
+import time
+
+from app.utils.token_cache import TokenCache
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = TokenCache(max_size=2)
+    expires_at = time.time() + 60
+    cache.put("a", {"exp": expires_at})
+    cache.put("b", {"exp": expires_at})
+    assert cache.get("a") is not None
+
+    cache.put("c", {"exp": expires_at})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_and_unbounded_entries_are_not_served():
+    cache = TokenCache(max_size=2)
+    cache.put("expired", {"exp": time.time() - 1})
+    cache.put("no-exp", {"sub": "u1"})
+
+    assert cache.get("expired") is None
+    assert cache.get("no-exp") is None
+    assert cache.stats()["size"] == 0
+
+
+async def test_batch_check_rejects_revoked_tokens_served_from_cache(auth_service):
+    revoked = await auth_service.create_access_token({"sub": "u1"})
+    live = await auth_service.create_access_token({"sub": "u2"})
+    await auth_service.verify_tokens([revoked, live])
+
+    assert await auth_service.revoke_token(revoked)
+    results = await auth_service.verify_tokens([revoked, live, "not-a-token"])
+
+    assert results[0] == (None, "Token has been revoked")
+    assert results[1][0]["sub"] == "u2"
+    assert results[2][0] is None and results[2][1]